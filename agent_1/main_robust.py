@@ -2,12 +2,13 @@
 import sys
 import os
 from pathlib import Path
-import pandas as pd
 from datetime import datetime
 import random
 
 sys.path.insert(0, str(Path(__file__).parent))
 
+from scrapers.results import save_results
+
 def create_sample_listings(num_listings):
     """Create sample listings for testing when real scraping fails"""
     sources = ["BizBuySell", "BizQuest", "LoopNet"]
@@ -35,43 +36,26 @@ def try_real_scrapers(num_listings):
     """Try to use real scrapers, fall back to sample data if fails"""
     try:
         # Try to import and use real scrapers
-        from config import SCRAPING_CONFIG, OUTPUT_CONFIG
-        from scrapers.bizbuysell import scrape_bizbuysell
-        from scrapers.bizquest import scrape_bizquest
-        from scrapers.loopnet import scrape_loopnet
+        from config import SCRAPING_CONFIG
+        from scrapers.engine import run_sources
         
-        # Update config
-        SCRAPING_CONFIG["bizbuysell"]["max_listings"] = num_listings
-        SCRAPING_CONFIG["bizquest"]["max_listings"] = num_listings
-        SCRAPING_CONFIG["loopnet"]["max_listings"] = num_listings
+        def sample_fallback(source):
+            # Generate sample data for a source that failed
+            scraper_name = SCRAPING_CONFIG[source]["name"]
+            sample_listings = create_sample_listings(num_listings//3)
+            for listing in sample_listings:
+                listing['Source'] = scraper_name
+            print(f"Using sample data for {scraper_name}: {len(sample_listings)} listings")
+            return sample_listings
         
-        all_listings = []
+        results = run_sources(max_listings=num_listings//3, fallback=sample_fallback)
         
-        # Try each scraper
-        for scraper_name, scraper_func in [
-            ("BizBuySell", scrape_bizbuysell),
-            ("BizQuest", scrape_bizquest), 
-            ("LoopNet", scrape_loopnet)
-        ]:
-            try:
-                print(f"\nTrying {scraper_name}...")
-                listings = scraper_func(max_listings=num_listings//3, max_pages=2)
-                if listings:
-                    # Ensure Source field
-                    for listing in listings:
-                        listing['Source'] = scraper_name
-                    all_listings.extend(listings)
-                    print(f"{scraper_name} completed: {len(listings)} listings")
-                else:
-                    print(f"{scraper_name} returned no listings")
-            except Exception as e:
-                print(f"{scraper_name} failed: {str(e)}")
-                # Generate sample data for this source
-                sample_listings = create_sample_listings(num_listings//3)
-                for listing in sample_listings:
-                    listing['Source'] = scraper_name
-                all_listings.extend(sample_listings)
-                print(f"Using sample data for {scraper_name}: {len(sample_listings)} listings")
+        all_listings = []
+        for source, listings in results.items():
+            scraper_name = SCRAPING_CONFIG[source]["name"]
+            if not listings:
+                print(f"{scraper_name} returned no listings")
+            all_listings.extend(listings)
         
         return all_listings
         
@@ -99,35 +83,7 @@ def main():
     # Try real scrapers first
     all_listings = try_real_scrapers(num_listings)
     
-    if all_listings:
-        df = pd.DataFrame(all_listings)
-        
-        # Create output directory
-        output_path = Path(__file__).parent / "output" / "listings.csv"
-        output_path.parent.mkdir(exist_ok=True)
-        
-        # Save CSV
-        df.to_csv(output_path, index=False)
-        
-        # Print summary
-        print("\n" + "="*70)
-        print("AGENT 1 EXECUTION COMPLETE")
-        print("="*70)
-        print(f"\nFinal Statistics:")
-        print(f"  Total Listings: {len(all_listings)}")
-        
-        for source in ["BizBuySell", "BizQuest", "LoopNet"]:
-            count = len([l for l in all_listings if l.get('Source') == source])
-            print(f"  - {source}: {count} listings")
-        
-        print(f"\nOutput File: {output_path}")
-        print(f"File Size: {output_path.stat().st_size / 1024:.2f} KB")
-        print("="*70)
-        
-        return all_listings
-    else:
-        print("\nWARNING: No listings generated")
-        return []
+    return save_results(all_listings, output_file="output/listings.csv")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,54 @@
+"""
+Shared browser sessions for Agent 1
+
+Every scraper worker (discovery shards and listing pages, across all sources)
+opens its browser through browser_session(), which caps how many are open at once
+and routes the browser through the proxy exit it is given. Page loads on one
+site (and exit) are paced through the shared RATE_LIMITER.
+"""
+
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from seleniumbase import SB
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from config import GENERAL_CONFIG, SCRAPING_CONFIG
+from graph.shared.frontier import url_domain
+from graph.shared.metrics import recorder
+from graph.shared.proxies import ProxyPool
+from graph.shared.ratelimit import DomainRateLimiter
+
+METRICS = recorder("agent_1")
+
+BROWSER_SLOTS = threading.BoundedSemaphore(GENERAL_CONFIG["max_browsers"])
+
+PROXY_POOL = ProxyPool.from_config(GENERAL_CONFIG["proxies"])
+
+# Politeness between page loads (search shards and listings), per site and exit
+# (from each source's rate_limit)
+RATE_LIMITER = DomainRateLimiter(
+    delay=(GENERAL_CONFIG["delay_between_listings"], GENERAL_CONFIG["delay_between_listings"]),
+    per_domain={
+        url_domain(spec["discovery_url"]): spec["rate_limit"]
+        for spec in SCRAPING_CONFIG.values()
+    },
+)
+
+
+@contextmanager
+def browser_session(egress=None):
+    """
+    UC-mode browser that holds one of the global browser slots while open.
+    `egress` is a ProxyExit from PROXY_POOL (None = direct connection).
+    """
+    with BROWSER_SLOTS:
+        start = time.perf_counter()
+        with SB(uc=True, headless=GENERAL_CONFIG["headless"],
+                proxy=egress.sb_proxy if egress else None) as sb:
+            METRICS.record("launch", "browser", time.perf_counter() - start)
+            yield sb
@@ -0,0 +1,139 @@
+"""
+Sharded link discovery
+
+Splits each source's search into shards (state, industry category, price band),
+runs the shards in parallel - one browser per worker - and merges the URL sets
+through a shared URLFrontier (canonical de-duplication, new listings first).
+Shard pages are paced per site and exit by the same RATE_LIMITER as listings.
+"""
+
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import zip_longest
+from pathlib import Path
+from queue import Queue, Empty
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from config import SCRAPING_CONFIG, SHARD_CONFIG, OUTPUT_CONFIG
+from scrapers.browser import browser_session, METRICS, PROXY_POOL, RATE_LIMITER
+from graph.shared.frontier import URLFrontier, url_domain
+from graph.shared.proxies import ProxyPool
+from graph.shared.crawler import fetch_sitemap_urls
+
+URL_HISTORY = Path(__file__).resolve().parent.parent / OUTPUT_CONFIG["url_history"]
+
+
+def build_shards(source):
+    """Return [(label, url), ...] for a source, interleaving the shard kinds"""
+    templates = SCRAPING_CONFIG[source].get("shard_urls", {})
+    by_kind = []
+
+    if "state" in templates:
+        by_kind.append([
+            (f"state:{code}", templates["state"].format(state=slug, state_code=code))
+            for slug, code in SHARD_CONFIG["states"]
+        ])
+
+    if "category" in templates:
+        by_kind.append([
+            (f"category:{category}", templates["category"].format(category=category))
+            for category in SCRAPING_CONFIG[source].get("categories", [])
+        ])
+
+    if "price" in templates:
+        by_kind.append([
+            (f"price:{low}-{high}", templates["price"].format(price_min=low, price_max=high))
+            for low, high in SHARD_CONFIG["price_bands"]
+        ])
+
+    # Interleave so an early stop still covers every kind of shard
+    shards = []
+    for group in zip_longest(*by_kind):
+        shards.extend(s for s in group if s)
+    return shards
+
+
+def discover_links(source, collect, max_links, workers=None):
+    """
+    Run `collect(sb, max_count, url=...)` over every shard of `source` in parallel.
+
+    Args:
+        source: key in SCRAPING_CONFIG
+        collect: link collector for one search page, returns list of hrefs
+        max_links: stop dispatching shards once this many new links are found
+        workers: parallel browsers (default SHARD_CONFIG["workers"])
+
+    Returns merged, de-duplicated links. Links scraped in earlier runs
+    (URL history) are only used to fill up after the new ones.
+    """
+    frontier = URLFrontier(history_path=URL_HISTORY)
+    fresh = 0
+    lock = threading.Lock()
+
+    # Sitemaps need no JavaScript: fetch them over plain HTTP first
+    sitemaps = SCRAPING_CONFIG[source].get("sitemap_urls")
+    if sitemaps:
+        found = fetch_sitemap_urls(
+            sitemaps,
+            contains=SCRAPING_CONFIG[source]["link_pattern"],
+            max_urls=max_links * 4,
+        )
+        for href in found:
+            if frontier.add(href) and not frontier.seen_before(href):
+                fresh += 1
+        print(f"\n{source}: {len(found)} links from sitemaps ({fresh} new)")
+        if fresh >= max_links:
+            return frontier.drain(max_links)
+
+    shards = build_shards(source)
+    if not shards:
+        return frontier.drain(max_links)
+
+    workers = max(1, min(workers or SHARD_CONFIG["workers"], len(shards)))
+    print(f"\n{source}: discovering links over {len(shards)} shards with {workers} workers")
+
+    pending = Queue()
+    for shard in shards:
+        pending.put(shard)
+
+    def enough():
+        with lock:
+            return fresh >= max_links
+
+    def worker():
+        nonlocal fresh
+        with PROXY_POOL.session() as egress, browser_session(egress) as sb:
+            while not enough():
+                try:
+                    label, url = pending.get_nowait()
+                except Empty:
+                    return
+                domain = url_domain(url)
+                METRICS.record("politeness", domain,
+                               RATE_LIMITER.wait(ProxyPool.key(domain, egress)), url=url)
+                try:
+                    found = collect(sb, max_links, url=url)
+                except Exception as e:
+                    print(f"   ⚠ Shard {label} failed: {str(e)[:60]}")
+                    continue
+
+                new = 0
+                with lock:
+                    for href in found:
+                        if frontier.add(href):
+                            new += 1
+                            if not frontier.seen_before(href):
+                                fresh += 1
+                print(f"   Shard {label}: {len(found)} links ({new} new)")
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for future in [pool.submit(worker) for _ in range(workers)]:
+            try:
+                future.result()
+            except Exception as e:
+                print(f"   ⚠ Discovery worker failed: {str(e)[:60]}")
+
+    print(f"   Discovered {len(frontier)} unique links ({fresh} not seen in earlier runs)")
+    return frontier.drain(max_links)
@@ -0,0 +1,297 @@
+"""
+Generic scraping engine
+
+Runs every source declared in config.SCRAPING_CONFIG: link discovery (sharded
+and/or from sitemaps when configured), then listing pages spread across the
+source's browsers and paced per domain. With proxy exits configured each exit
+gets its own browsers and its own pacing, so throughput grows with the pool.
+All enabled sources run together.
+"""
+
+import random
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from queue import Queue, Empty
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from config import SCRAPING_CONFIG, SHARD_CONFIG, GENERAL_CONFIG, OUTPUT_CONFIG
+from scrapers.browser import browser_session, PROXY_POOL, RATE_LIMITER
+from scrapers.discovery import discover_links
+from scrapers.results import save_intermediate
+from graph.shared.frontier import URLFrontier, url_domain
+from graph.shared.proxies import ProxyPool
+from graph.shared.metrics import recorder
+from graph.shared.normalize import normalize_money
+from graph.shared.pages import save_page
+from graph.shared.resilience import (
+    DomainBreakers, RetryBudget, CircuitOpenError, ChallengeError,
+    call_with_retry, is_challenge,
+)
+
+METRICS = recorder("agent_1")
+
+# A site that keeps failing is cut off for a while instead of burning the run
+BREAKERS = DomainBreakers(GENERAL_CONFIG["breaker_failures"], GENERAL_CONFIG["breaker_reset"])
+RETRY_BUDGET = RetryBudget(GENERAL_CONFIG["retry_budget"])
+
+
+PAGES_DIR = Path(__file__).resolve().parent.parent / OUTPUT_CONFIG["page_archive"]
+
+
+# ---------------- helpers ----------------
+
+def find_value(keyword, text, require_dollar=True):
+    """Find the money value that follows `keyword` in page text"""
+    money = r"\d[\d,.]*(?:\s*(?:million|thousand|[km])\b)?"
+    value = rf"(\${money})" if require_dollar else rf"\$?({money})"
+    for pattern in [rf"{keyword}[:\s]*{value}", rf"{keyword}.*?{value}"]:
+        match = re.search(pattern, text, re.I)
+        if match:
+            return match.group(1)
+    return None
+
+
+def _wait(sb, wait):
+    """Apply a declared wait condition: element to wait for, then a settle sleep"""
+    if wait.get("selector"):
+        sb.wait_for_element(wait["selector"], timeout=wait["timeout"])
+    sb.sleep(random.uniform(*wait["sleep"]))
+
+
+# ---------------- discovery ----------------
+
+def collect_links(sb, source, max_count, url=None):
+    """Collect listing URLs from one search page of `source`"""
+    spec = SCRAPING_CONFIG[source]
+    url = url or spec["discovery_url"]
+    print(f"\n{spec['name']}: collecting {max_count} links")
+
+    domain = url_domain(url)
+    wait = spec["discovery_wait"]
+    with METRICS.span("navigation", domain, url):
+        sb.uc_open_with_reconnect(url, reconnect_time=wait["reconnect_time"])
+
+    with METRICS.span("wait", domain, url):
+        _wait(sb, wait)
+
+        # Scroll to load content
+        for i in range(spec["scroll_steps"]):
+            sb.execute_script(f"window.scrollTo(0, {1000*(i+1)});")
+            sb.sleep(1)
+
+    frontier = URLFrontier()
+    for attempt in range(spec["link_passes"]):
+        with METRICS.span("extraction", domain, url):
+            for el in sb.find_elements(spec["link_selector"]):
+                try:
+                    href = el.get_attribute("href")
+                except Exception:
+                    continue
+                if href and spec["link_pattern"] in href:
+                    frontier.add(href)
+                if len(frontier) >= max_count:
+                    break
+
+        if len(frontier) >= max_count or attempt == spec["link_passes"] - 1:
+            break
+        with METRICS.span("wait", domain, url):
+            sb.sleep(2)
+
+    links = frontier.drain()
+    print(f"   Collected {len(links)} links")
+    return links
+
+
+# ---------------- listing pages ----------------
+
+def scrape_listing(sb, source, url):
+    """Scrape one listing page into an Agent 1 record"""
+    spec = SCRAPING_CONFIG[source]
+
+    domain = url_domain(url)
+    wait = spec["detail_wait"]
+    with METRICS.span("navigation", domain, url):
+        sb.uc_open_with_reconnect(url, reconnect_time=wait["reconnect_time"])
+
+    with METRICS.span("wait", domain, url):
+        _wait(sb, wait)
+
+    with METRICS.span("extraction", domain, url):
+        body = sb.get_text("body")
+        if is_challenge(body):
+            raise ChallengeError(f"bot challenge on {domain}")
+        html = sb.get_page_source() if OUTPUT_CONFIG["page_archive"] else None
+
+        title = None
+        for selector in spec["title_selectors"]:
+            try:
+                if sb.is_element_present(selector):
+                    text = sb.get_text(selector).strip()
+                    if text and len(text) > 5:
+                        title = text
+                        break
+            except Exception:
+                continue
+
+    record = {
+        "Business Name": title or spec["default_title"],
+        "Industry": "Not Specified",
+        "Location": "Not Specified",
+    }
+    for column, keyword in spec["fields"].items():
+        record[column] = normalize_money(find_value(keyword, body, spec["require_dollar"]))
+    record.update({
+        "Years in Operation": "Not Disclosed",
+        "Broker or Seller Contact": "Not Available",
+        "Listing URL": url,
+        "Source": spec["name"],
+    })
+    record.update(spec["defaults"])
+    if html:
+        # Agent 2 extracts from this snapshot instead of loading the page again
+        record["Page Archive"] = save_page(PAGES_DIR, url, html)
+    return record
+
+
+def scrape_source(source, max_listings=None):
+    """Discover and scrape one source. Returns list[dict] in discovery order."""
+    spec = SCRAPING_CONFIG[source]
+    name = spec["name"]
+    max_listings = max_listings or spec["max_listings"]
+    print(f"\n{name} target: {max_listings} listings")
+
+    def collect(sb, max_count, url=None):
+        url = url or spec["discovery_url"]
+        return call_with_retry(
+            lambda: collect_links(sb, source, max_count, url=url),
+            url_domain(url), BREAKERS, RETRY_BUDGET,
+            attempts=GENERAL_CONFIG["retry_attempts"], metrics=METRICS, url=url,
+        )
+
+    links = None
+    if SHARD_CONFIG["enabled"] or spec.get("sitemap_urls"):
+        links = discover_links(source, collect, max_listings)
+
+    if not links:
+        with PROXY_POOL.session() as egress, browser_session(egress) as sb:
+            try:
+                links = collect(sb, max_listings)
+            except CircuitOpenError as e:
+                print(f"   ⚠ {name}: {e}")
+                links = []
+    links = links[:max_listings]
+
+    pending = Queue()
+    for i, link in enumerate(links):
+        pending.put((i, link))
+    results = [None] * len(links)
+    skipped = []
+
+    def worker():
+        while not pending.empty():
+            with PROXY_POOL.session() as egress, browser_session(egress) as sb:
+                while True:
+                    try:
+                        i, link = pending.get_nowait()
+                    except Empty:
+                        return
+
+                    domain = url_domain(link)
+
+                    def visit():
+                        # Only reached while the circuit allows it, so an open
+                        # circuit skips the politeness sleep as well as the page
+                        METRICS.record("politeness", domain,
+                                       RATE_LIMITER.wait(ProxyPool.key(domain, egress)), url=link)
+                        start = time.perf_counter()
+                        try:
+                            record = scrape_listing(sb, source, link)
+                        except ChallengeError:
+                            PROXY_POOL.report(egress, challenge=True)
+                            raise
+                        except Exception:
+                            PROXY_POOL.report(egress, ok=False)
+                            raise
+                        PROXY_POOL.report(egress, time.perf_counter() - start)
+                        return record
+
+                    print(f"[{name} {i + 1}/{len(links)}]")
+                    try:
+                        results[i] = call_with_retry(
+                            visit, domain, BREAKERS, RETRY_BUDGET,
+                            attempts=GENERAL_CONFIG["retry_attempts"], metrics=METRICS, url=link,
+                        )
+                        print(f"   Found: {results[i]['Business Name'][:40]}")
+                    except CircuitOpenError:
+                        skipped.append(link)
+                    except Exception as e:
+                        print(f"   ❌ Failed listing: {str(e)[:60]}")
+
+                    if len(PROXY_POOL) > 1 and not PROXY_POOL.healthy(egress):
+                        # Too many challenges on this exit: reopen the browser on another one
+                        print(f"   ⚠ Proxy {egress.name} unhealthy, switching exit")
+                        break
+
+    # concurrency is per exit, so more exits means more browsers on the source
+    workers = max(1, min(spec["concurrency"] * max(1, len(PROXY_POOL)), len(links)))
+    if links:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for future in [pool.submit(worker) for _ in range(workers)]:
+                future.result()
+
+    listings = [r for r in results if r]
+    if skipped:
+        print(f"   ⚠ {name}: circuit open, skipped {len(skipped)} listings")
+    print(f"✅ {name} Complete: {len(listings)} listings scraped")
+    return listings
+
+
+# ---------------- all sources ----------------
+
+def print_configuration():
+    print("\nScraping Configuration:")
+    for source, spec in SCRAPING_CONFIG.items():
+        if spec["enabled"]:
+            print(f"  {source.upper()}: {spec['max_listings']} listings "
+                  f"(concurrency {spec['concurrency']}, rate limit {spec['rate_limit']}s)")
+        else:
+            print(f"  {source.upper()}: Disabled")
+
+
+def run_sources(max_listings=None, fallback=None):
+    """
+    Scrape every enabled source concurrently.
+
+    Args:
+        max_listings: per-source override of SCRAPING_CONFIG[...]["max_listings"]
+        fallback: optional fallback(source) -> list[dict] used when a source fails
+
+    Returns {source: listings} in registry order.
+    """
+    enabled = [source for source, spec in SCRAPING_CONFIG.items() if spec["enabled"]]
+    results = {}
+    if not enabled:
+        return results
+
+    with ThreadPoolExecutor(max_workers=len(enabled)) as pool:
+        futures = {source: pool.submit(scrape_source, source, max_listings) for source in enabled}
+
+        for source, future in futures.items():
+            name = SCRAPING_CONFIG[source]["name"]
+            try:
+                listings = future.result()
+            except Exception as e:
+                print(f"❌ {name} Failed: {e}")
+                listings = fallback(source) if fallback else []
+
+            results[source] = listings
+            if OUTPUT_CONFIG["save_intermediate"]:
+                save_intermediate(listings, source)
+
+    PROXY_POOL.print_stats()
+    return results
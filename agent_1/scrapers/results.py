@@ -0,0 +1,70 @@
+"""
+Agent 1 output files
+
+Kept free of browser imports so the sample-data fallbacks can still save results.
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from config import OUTPUT_CONFIG
+from graph.shared.frontier import URLFrontier
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def save_intermediate(listings, source_name):
+    """Save intermediate CSV for each website"""
+    if not listings:
+        return
+
+    df = pd.DataFrame(listings)
+    output_path = BASE_DIR / f"output/{source_name}_listings.csv"
+    output_path.parent.mkdir(exist_ok=True)
+    df.to_csv(output_path, index=False)
+    print(f"  Intermediate saved: {output_path}")
+
+
+def save_results(all_listings, output_file=None):
+    """Write the final listings.csv, update the URL history and print statistics"""
+    if not all_listings:
+        print("\nWARNING: No listings scraped from any source")
+        return []
+
+    df = pd.DataFrame(all_listings)
+
+    # Create output directory
+    output_path = BASE_DIR / (output_file or OUTPUT_CONFIG["output_file"])
+    output_path.parent.mkdir(exist_ok=True)
+
+    # Save CSV
+    df.to_csv(output_path, index=False)
+
+    # Remember scraped listings so later discovery runs prioritize new ones
+    if "Listing URL" in df.columns:
+        history = URLFrontier(history_path=BASE_DIR / OUTPUT_CONFIG["url_history"])
+        for url in df["Listing URL"].dropna():
+            history.mark_done(url)
+        history.save()
+
+    # Print summary
+    print("\n" + "="*70)
+    print("AGENT 1 EXECUTION COMPLETE")
+    print("="*70)
+    print(f"\nFinal Statistics:")
+    print(f"  Total Listings: {len(all_listings)}")
+
+    if "Source" in df.columns:
+        for source, count in df["Source"].value_counts(sort=False).items():
+            print(f"  - {source}: {count} listings")
+
+    print(f"\nOutput File: {output_path}")
+    print(f"File Size: {output_path.stat().st_size / 1024:.2f} KB")
+    print("="*70)
+
+    return all_listings
@@ -15,12 +15,12 @@ if agent2_root not in sys.path:
 from agent.state import AgentState, BrokerRecord
 
 try:
-    from utils.validators import normalize_name, normalize_firm
+    from utils.entity_resolution import resolve_entities, is_placeholder
 except ImportError:
-    from agent_2.utils.validators import normalize_name, normalize_firm
+    from agent_2.utils.entity_resolution import resolve_entities, is_placeholder
 
 
-def deduplicate_brokers_node(state: AgentState) -> AgentState:
+def deduplicate_brokers_node(state: AgentState) -> dict:
     print("\n" + "="*60)
     print("NODE 3: DEDUPLICATION & UPSERT")
     print("="*60)
@@ -29,31 +29,16 @@ def deduplicate_brokers_node(state: AgentState) -> AgentState:
     
     if not extracted_brokers:
         print("⚠ No brokers")
-        state["current_stage"] = "deduplication_complete"
-        return state
+        return {"current_stage": "deduplication_complete"}
     
-    unique_brokers = []  # Fresh list
+    # Same email, phone or name+firm (or a near-identical name) -> one broker
+    resolved, merged = resolve_entities(extracted_brokers)
     
-    for broker in extracted_brokers:
-        norm_name = normalize_name(broker["broker_name"])
-        
-        # Skip bad names
-        if not norm_name or norm_name.lower() in ['not available', 'not availabl']:
-            continue
-        
-        # Check duplicate
-        is_dup = False
-        for existing in unique_brokers:
-            if normalize_name(existing["broker_name"]) == norm_name:
-                is_dup = True
-                break
-        
-        if not is_dup:
-            unique_brokers.append(broker)
-    
-    # CRITICAL: Replace, don't append!
-    state["broker_database"] = unique_brokers  # ← THIS LINE
-    state["current_stage"] = "deduplication_complete"
+    # Skip bad names (a nameless record may still have lent its email/phone to a merge above)
+    unique_brokers = [b for b in resolved if not is_placeholder(b.get("broker_name"))]
     
+    print(f"✓ Merged duplicates: {merged}")
     print(f"✓ Unique Entries: {len(unique_brokers)}")
-    return state
\ No newline at end of file
+    
+    # CRITICAL: Replace, don't append! (broker_database has no add reducer)
+    return {"broker_database": unique_brokers, "current_stage": "deduplication_complete"}
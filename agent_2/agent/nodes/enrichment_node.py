@@ -1,36 +1,28 @@
-from urllib.parse import quote
+import pandas as pd
 import sys
 from pathlib import Path
-import re
-import requests
 
 # Fix imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
 
 from agent.state import AgentState
-from config.settings import LINKEDIN_SEARCH_TEMPLATE
+from utils.columns import blank, linkedin_urls, records
+from graph.shared.contacts import best_email as extract_email
 
 
-# ---------------- EMAIL EXTRACTOR ----------------
-def extract_email(html):
-    if not html:
-        return None
+def fill_blank(df, column, *fallbacks):
+    """Fill a column's blanks from the first fallback column that has a value"""
+    if column not in df:
+        df[column] = None
+    for fallback in fallbacks:
+        if fallback in df:
+            missing = blank(df[column])
+            df.loc[missing, column] = df.loc[missing, fallback]
+    df[column] = df[column].fillna("")
 
-    emails = re.findall(
-        r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}",
-        html
-    )
-    if emails:
-        return emails[0]
 
-    mailto = re.findall(r"mailto:([^\"'>]+)", html)
-    if mailto:
-        return mailto[0]
-
-    return None
-
-
-def enrich_brokers_node(state: AgentState) -> AgentState:
+def enrich_brokers_node(state: AgentState) -> dict:
     """
     NODE 4:
     - Email enrichment (LEVEL 1)
@@ -44,53 +36,34 @@ def enrich_brokers_node(state: AgentState) -> AgentState:
     print("="*60)
 
     brokers = state.get("broker_database", [])
-    enriched_count = 0
-
-    for broker in brokers:
-
-        # ---------------- EMAIL (LEVEL 1) ----------------
-        if not broker.get("email"):
-            listing_html = broker.get("listing_html", "")
-            email = extract_email(listing_html)
-            if email:
-                broker["email"] = email
-                broker["email_source"] = "listing_page"
-
-        # ---------------- GEOGRAPHY ----------------
-        if not broker.get("geography"):
-            broker["geography"] = (
-                broker.get("listing_location")
-                or broker.get("location")
-                or ""
-            )
-
-        # ---------------- INDUSTRY FOCUS ----------------
-        if not broker.get("industry_focus"):
-            broker["industry_focus"] = (
-                broker.get("listing_industry")
-                or broker.get("industry")
-                or ""
-            )
-
-        # ---------------- LINKEDIN URL ----------------
-        name = broker.get("broker_name", "")
-        firm = broker.get("brokerage_firm", "")
-
-        if name:
-            linkedin_url = LINKEDIN_SEARCH_TEMPLATE.format(
-                name=quote(name),
-                firm=quote(firm) if firm else ""
-            )
-            broker["linkedin_search_url"] = linkedin_url
-
-        enriched_count += 1
-
-    state["broker_database"] = brokers
-    state["current_stage"] = "enrichment_complete"
-
-    print(f"✓ Enriched {enriched_count} brokers")
-    print(f"✓ Emails found: {sum(1 for b in brokers if b.get('email'))}")
-    print(f"✓ Geography filled: {sum(1 for b in brokers if b.get('geography'))}")
-    print(f"✓ Industry filled: {sum(1 for b in brokers if b.get('industry_focus'))}")
-
-    return state
+    if not brokers:
+        print("✓ Enriched 0 brokers")
+        return {"current_stage": "enrichment_complete"}
+
+    # One column at a time over all brokers
+    df = pd.DataFrame(brokers)
+    for column in ("email", "email_source", "broker_name", "brokerage_firm"):
+        if column not in df:
+            df[column] = None
+
+    # ---------------- EMAIL (LEVEL 1) ----------------
+    if "listing_html" in df:
+        needs = blank(df["email"]) & ~blank(df["listing_html"])
+        found = df.loc[needs, "listing_html"].map(extract_email)
+        found = found[found.notna()]
+        df.loc[found.index, "email"] = found
+        df.loc[found.index, "email_source"] = "listing_page"
+
+    # ---------------- GEOGRAPHY / INDUSTRY FOCUS ----------------
+    fill_blank(df, "geography", "listing_location", "location")
+    fill_blank(df, "industry_focus", "listing_industry", "industry")
+
+    # ---------------- LINKEDIN URL ----------------
+    df["linkedin_search_url"] = linkedin_urls(df["broker_name"], df["brokerage_firm"])
+
+    print(f"✓ Enriched {len(df)} brokers")
+    print(f"✓ Emails found: {int((~blank(df['email'])).sum())}")
+    print(f"✓ Geography filled: {int((df['geography'] != '').sum())}")
+    print(f"✓ Industry filled: {int((df['industry_focus'] != '').sum())}")
+
+    return {"broker_database": records(df), "current_stage": "enrichment_complete"}
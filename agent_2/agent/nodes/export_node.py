@@ -1,62 +1,61 @@
 import pandas as pd
 import sys
 from pathlib import Path
-from urllib.parse import quote_plus
-import re
-import requests
-import uuid
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from agent.state import AgentState
-from config.settings import OUTPUT_CSV
+from config.settings import OUTPUT_CSV, SCRAPING_CONFIG, EXTRACTION_JOURNAL
+from utils.scraper import PROXY_POOL, HTTP_CACHE
+from graph.shared.contacts import best_email as extract_email
+from graph.shared.crawler import crawl
+from graph.shared.database import PipelineDB
+from graph.shared.metrics import run_id
+from utils.journal import ExtractionJournal
+from utils.columns import blank, linkedin_urls, excel_safe, new_record_ids, records
 
 
 # =====================================================
 # HELPERS
 # =====================================================
 
-def excel_safe_phone(phone):
-    """Make phone Excel-proof"""
-    if not phone or str(phone).strip() == "":
-        return ""
-    phone = str(phone).strip()
-    return f'="{phone}"'
-
-
-def extract_email(html):
-    """Extract email from HTML using regex or mailto"""
-    if not html:
-        return None
-
-    emails = re.findall(
-        r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}",
-        html
+def fetch_profiles(df):
+    """
+    Fetch every broker profile the export loop will need, concurrently and
+    once per URL, over one pooled session (capped per host). Returns
+    {profile_url: html} for the pages that loaded.
+    """
+    if "broker_profile_url" not in df:
+        return {}
+    candidates = df[blank(df["email"]) & ~blank(df["broker_profile_url"])]
+    if "listing_html" in candidates:
+        candidates = candidates[candidates["listing_html"].map(extract_email).isna()]
+    urls = sorted(set(candidates["broker_profile_url"]))
+    if not urls:
+        return {}
+
+    print(f"Fetching {len(urls)} broker profiles...")
+    results = crawl(
+        urls,
+        concurrency=SCRAPING_CONFIG["profile_concurrency"],
+        per_host=SCRAPING_CONFIG["profile_per_host"],
+        timeout=SCRAPING_CONFIG["profile_timeout"],
+        proxy_pool=PROXY_POOL,
+        cache=HTTP_CACHE,
     )
-    if emails:
-        return emails[0]
-
-    mailto = re.findall(r"mailto:([^\"'>]+)", html)
-    if mailto:
-        return mailto[0]
-
-    return None
 
-
-def fetch_page(url):
-    """Simple GET request with safety"""
-    try:
-        headers = {"User-Agent": "Mozilla/5.0"}
-        r = requests.get(url, headers=headers, timeout=10)
-        if r.status_code == 200:
-            return r.text
-    except Exception as e:
-        print(f"⚠ Failed to fetch {url}: {e}")
-    return None
+    pages = {}
+    for r in results:
+        if r["status"] == 200:
+            pages[r["url"]] = r["text"]
+        else:
+            print(f"⚠ Failed to fetch {r['url']}: {r['error'] or r['status']}")
+    print(f"✓ {len(pages)}/{len(urls)} profiles fetched")
+    return pages
 
 
-def get_email_for_broker(broker):
-    """LEVEL 1 + LEVEL 2 email extraction"""
+def get_email_for_broker(broker, profiles):
+    """LEVEL 1 + LEVEL 2 email extraction (profiles prefetched by fetch_profiles)"""
 
     listing_html = broker.get("listing_html", "")
     email = extract_email(listing_html)
@@ -65,8 +64,7 @@ def get_email_for_broker(broker):
 
     profile_url = broker.get("broker_profile_url", "")
     if profile_url:
-        profile_html = fetch_page(profile_url)
-        email = extract_email(profile_html)
+        email = extract_email(profiles.get(profile_url))
         if email:
             return email, "broker_profile"
 
@@ -77,7 +75,7 @@ def get_email_for_broker(broker):
 # EXPORT NODE
 # =====================================================
 
-def export_brokers_node(state: AgentState) -> AgentState:
+def export_brokers_node(state: AgentState) -> dict:
     """Export brokers with email enrichment + record_id"""
 
     print("\n" + "=" * 60)
@@ -85,47 +83,55 @@ def export_brokers_node(state: AgentState) -> AgentState:
     print("=" * 60)
 
     brokers = state.get("broker_database", [])
+    run = run_id()
 
     if not brokers:
+        # The run still finished: its listings go to the store and a rerun starts fresh
+        with PipelineDB() as db:
+            db.upsert_listings(state.get("input_listings", []), run_id=run)
+        ExtractionJournal(EXTRACTION_JOURNAL).clear()
         print("⚠ No brokers to export")
-        state["current_stage"] = "export_complete"
-        return state
-
-    cleaned = []
-
-    for b in brokers:
-        broker = b.copy()
-
-        # ----------------- SAFETY: record_id -----------------
-        broker.setdefault("record_id", f"broker_{uuid.uuid4().hex}")
-
-        # ----------------- Excel-safe phone -----------------
-        broker["phone"] = excel_safe_phone(broker.get("phone"))
-
-        # ----------------- Auto email extraction -----------------
-        if not broker.get("email"):
-            email, source = get_email_for_broker(broker)
-            broker["email"] = email if email else ""
-            broker["email_source"] = source
-        else:
-            broker["email_source"] = "existing"
-
-        # ----------------- LinkedIn search URL -----------------
-        name = broker.get("broker_name", "")
-        if name and name.lower() != "not available":
-            broker["linkedin_search_url"] = (
-                f"https://www.linkedin.com/search/results/all/?keywords={quote_plus(name)}"
-            )
-        else:
-            broker["linkedin_search_url"] = ""
-
-        cleaned.append(broker)
-
-    df = pd.DataFrame(cleaned)
-
-    # ----------------- DEDUP (phone is strongest key) -----------------
-    if "phone" in df.columns:
-        df = df.drop_duplicates(subset=["phone"], keep="first")
+        return {"current_stage": "export_complete"}
+
+    # One column at a time over all brokers
+    df = pd.DataFrame(brokers)
+    for column in ("record_id", "broker_name", "brokerage_firm", "email", "email_source",
+                   "phone", "linkedin_search_url"):
+        if column not in df:
+            df[column] = None
+
+    # ----------------- SAFETY: record_id -----------------
+    missing = blank(df["record_id"])
+    df.loc[missing, "record_id"] = new_record_ids(int(missing.sum()))
+
+    # ----------------- Auto email extraction -----------------
+    # Only brokers without an email need per-broker work (profiles fetched in one batch)
+    has_email = ~blank(df["email"])
+    df.loc[has_email & blank(df["email_source"]), "email_source"] = "existing"
+    if (~has_email).any():
+        profiles = fetch_profiles(df)
+        found = [get_email_for_broker(broker, profiles) for broker in records(df[~has_email])]
+        df.loc[~has_email, "email"] = [email or "" for email, _ in found]
+        df.loc[~has_email, "email_source"] = [source for _, source in found]
+
+    # ----------------- LinkedIn search URL -----------------
+    no_url = blank(df["linkedin_search_url"])
+    df.loc[no_url, "linkedin_search_url"] = linkedin_urls(df.loc[no_url, "broker_name"],
+                                                          df.loc[no_url, "brokerage_firm"])
+    cleaned = records(df)
+
+    # ----------------- MASTER STORE -----------------
+    # Duplicates within this run were merged by the deduplicate node; the store
+    # matches them against earlier runs (email, phone, name+firm). The CSV gets
+    # this run's brokers, each with everything the store knows about them.
+    with PipelineDB() as db:
+        db.upsert_listings(state.get("input_listings", []), run_id=run)
+        db.upsert_brokers(cleaned, run_id=run)
+        df = db.brokers_df(run_id=run).fillna("")
+        print(f"✓ Master store: {db.count('brokers')} brokers, {db.count('listings')} listings ({db.path})")
+
+    # ----------------- Excel-safe phone -----------------
+    df["phone"] = excel_safe(df["phone"])
 
     # ----------------- COLUMN ORDER -----------------
     cols = [
@@ -149,11 +155,11 @@ def export_brokers_node(state: AgentState) -> AgentState:
     # ----------------- SAVE CSV -----------------
     df.to_csv(OUTPUT_CSV, index=False, encoding="utf-8-sig")
 
+    # Everything extracted is in the store and the CSV: a rerun starts fresh
+    ExtractionJournal(EXTRACTION_JOURNAL).clear()
+
     print(f"\n✓ Exported {len(df)} brokers to: {OUTPUT_CSV}")
     print(f"✓ Valid phones: {(df['phone'] != '').sum() if 'phone' in df else 0}")
     print(f"✓ Valid emails: {(df['email'] != '').sum() if 'email' in df else 0}")
 
-    state["output_path"] = str(OUTPUT_CSV)
-    state["current_stage"] = "export_complete"
-
-    return state
+    return {"output_path": str(OUTPUT_CSV), "current_stage": "export_complete"}
@@ -2,6 +2,7 @@ import sys
 import re
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from agent.state import AgentState, BrokerRecord
 
 # Path fix
@@ -9,10 +10,140 @@ agent2_root = Path(__file__).resolve().parent.parent.parent
 if str(agent2_root) not in sys.path:
     sys.path.insert(0, str(agent2_root))
 
-from utils.scraper import BrokerScraper, random_delay
+from config.settings import SCRAPING_CONFIG, PAGES_DIR, EXTRACTION_JOURNAL
+from utils.journal import ExtractionJournal
+from utils.scraper import BrokerScraper, CircuitOpenError, PROXY_POOL, RATE_LIMITER
+from graph.shared.frontier import url_domain
+from graph.shared.ratelimit import DomainScheduler
+from graph.shared.pages import load_page
+
+
+# Outcome of one listing
+ADDED, NO_DATA, SKIPPED, FAILED = "added", "no_data", "skipped", "failed"
+
+
+def schedule_by_domain(listings, indices):
+    """Listing indices queued per domain; workers take whichever site is ready to be hit"""
+    return DomainScheduler(RATE_LIMITER, ((url_domain(listings[i]["Listing URL"]), i) for i in indices))
+
+
+def extract_listing(scraper, listing, label):
+    """Deep-extract one listing. Returns (status, broker_record or None, error or None)."""
+    listing_url = listing.get("Listing URL", "")
+    lines = [f"\n{label} Processing: {listing_url[:80]}..."]
+    log = lines.append
+    status, error = NO_DATA, None
+
+    try:
+        # ---------------- BASE RECORD ----------------
+        broker_record: BrokerRecord = {
+            "broker_name": listing.get("Broker or Seller Contact") or "Not Available",
+            "brokerage_firm": "Independent",
+            "email": None,
+            "phone": None,
+            "industry_focus": listing.get("Industry") or "General",
+            "geography": listing.get("Location") or "Not Specified",
+            "linkedin_search_url": None,
+            "source_listing_url": listing_url,
+            "extraction_timestamp": datetime.now().isoformat()
+        }
+
+        # ---------------- DEEP EXTRACTION ----------------
+        try:
+            # Agent 1's captured page first; live site only if contacts are hidden
+            snapshot = load_page(PAGES_DIR, listing.get("Page Archive"))
+            broker_data = scraper.extract_broker_data(listing_url, snapshot=snapshot)
+            if broker_data.get("error"):
+                # Whatever the snapshot had is kept, but the listing counts as failed
+                error = f"{listing_url}: live page error: {broker_data['error'][:60]}"
+
+            # ---- Broker Name (CRITICAL FIX)
+            scraped_name = (
+                broker_data.get("broker_name")
+                or broker_data.get("contact_name")
+                or broker_data.get("agent_name")
+            )
+
+            if scraped_name and scraped_name.lower() not in [
+                "contact broker", "view profile", "seller"
+            ]:
+                broker_record["broker_name"] = scraped_name.strip()
+                log(f"  ✓ Broker Name: {broker_record['broker_name']}")
+
+            # ---- Brokerage Firm
+            firm = (
+                broker_data.get("firm")
+                or broker_data.get("brokerage_firm")
+                or broker_data.get("company")
+            )
+
+            if firm:
+                broker_record["brokerage_firm"] = firm.strip()
+                log(f"  ✓ Firm: {broker_record['brokerage_firm']}")
+
+            # ---- Email (IMPROVED LOGIC)
+            email = (
+                broker_data.get("email")
+                or broker_data.get("mailto_email")
+                or broker_data.get("decoded_email")
+            )
+
+            if email and "@" in email:
+                broker_record["email"] = email.lower()
+                log(f"  ✓ Email: {email}")
+
+            # ---- Phone (ALREADY CORRECT – kept safe)
+            raw_phone = broker_data.get("phone")
+            if raw_phone:
+                digits = re.sub(r"\D", "", str(raw_phone))
+                if len(digits) >= 10:
+                    clean_phone = f"+1-{digits[-10:-7]}-{digits[-7:-4]}-{digits[-4:]}"
+                    broker_record["phone"] = clean_phone
+                    log(f"  ✓ Phone Saved: {clean_phone}")
+
+            # ---- Geography enrichment
+            broker_record["geography"] = (
+                broker_data.get("location")
+                or broker_record["geography"]
+            )
+
+            # ---- Industry enrichment
+            broker_record["industry_focus"] = (
+                broker_data.get("industry_focus")
+                or broker_record["industry_focus"]
+            )
+
+        except CircuitOpenError as e:
+            # Site is cut off: skip at once, no browser and no delay
+            log(f"  ⏭ Skipped: {e}")
+            return SKIPPED, None, None
+        except Exception as e:
+            error = f"{listing_url}: deep extraction error: {str(e)[:60]}"
+            log(f"  ⚠ Deep extraction error: {str(e)[:60]}")
+
+        # ---------------- VALIDATION ----------------
+        has_contact = broker_record.get("email") or broker_record.get("phone")
+        has_name = broker_record.get("broker_name") not in ["Not Available", "", None]
+
+        if has_contact or has_name:
+            status = ADDED
+            log("  ✅ Added to Broker Database")
+        else:
+            broker_record = None
+            log("  ⚠ Skipped: No useful broker data")
+
+        return status, broker_record, error
+
+    except Exception as e:
+        log(f"  ❌ Failed listing: {str(e)[:80]}")
+        return FAILED, None, f"{listing_url}: {str(e)[:80]}"
+
+    finally:
+        # One block per listing so parallel workers don't interleave lines
+        print("\n".join(lines))
 
 
-def deep_extraction_node(state: AgentState) -> AgentState:
+def deep_extraction_node(state: AgentState) -> dict:
     """Extract broker data (FINAL FIXED VERSION)"""
 
     print("\n" + "=" * 60)
@@ -22,117 +153,79 @@ def deep_extraction_node(state: AgentState) -> AgentState:
     listings = state.get("listings_to_process", [])
     if not listings:
         print("⚠ No listings found.")
-        state["broker_database"] = []
-        return state
-
-    scraper = BrokerScraper()
-    extracted = []
-    processed = 0
-
-    for idx, listing in enumerate(listings, 1):
-        listing_url = listing.get("Listing URL", "")
-        if not listing_url:
+        return {"broker_database": []}
+
+    # Listings finished before an interrupted run are taken from the journal, not revisited
+    journal = ExtractionJournal(EXTRACTION_JOURNAL)
+    results = [None] * len(listings)
+    todo = []
+    for i, listing in enumerate(listings):
+        url = listing.get("Listing URL")
+        if not url:
             continue
-
-        print(f"\n[{idx}/{len(listings)}] Processing: {listing_url[:80]}...")
-
-        try:
-            # ---------------- BASE RECORD ----------------
-            broker_record: BrokerRecord = {
-                "broker_name": listing.get("Broker or Seller Contact") or "Not Available",
-                "brokerage_firm": "Independent",
-                "email": None,
-                "phone": None,
-                "industry_focus": listing.get("Industry") or "General",
-                "geography": listing.get("Location") or "Not Specified",
-                "linkedin_search_url": None,
-                "source_listing_url": listing_url,
-                "extraction_timestamp": datetime.now().isoformat()
-            }
-
-            # ---------------- DEEP EXTRACTION ----------------
-            try:
-                broker_data = scraper.extract_broker_data(listing_url)
-
-                # ---- Broker Name (CRITICAL FIX)
-                scraped_name = (
-                    broker_data.get("broker_name")
-                    or broker_data.get("contact_name")
-                    or broker_data.get("agent_name")
-                )
-
-                if scraped_name and scraped_name.lower() not in [
-                    "contact broker", "view profile", "seller"
-                ]:
-                    broker_record["broker_name"] = scraped_name.strip()
-                    print(f"  ✓ Broker Name: {broker_record['broker_name']}")
-
-                # ---- Brokerage Firm
-                firm = (
-                    broker_data.get("firm")
-                    or broker_data.get("brokerage_firm")
-                    or broker_data.get("company")
-                )
-
-                if firm:
-                    broker_record["brokerage_firm"] = firm.strip()
-                    print(f"  ✓ Firm: {broker_record['brokerage_firm']}")
-
-                # ---- Email (IMPROVED LOGIC)
-                email = (
-                    broker_data.get("email")
-                    or broker_data.get("mailto_email")
-                    or broker_data.get("decoded_email")
-                )
-
-                if email and "@" in email:
-                    broker_record["email"] = email.lower()
-                    print(f"  ✓ Email: {email}")
-
-                # ---- Phone (ALREADY CORRECT – kept safe)
-                raw_phone = broker_data.get("phone")
-                if raw_phone:
-                    digits = re.sub(r"\D", "", str(raw_phone))
-                    if len(digits) >= 10:
-                        clean_phone = f"+1-{digits[-10:-7]}-{digits[-7:-4]}-{digits[-4:]}"
-                        broker_record["phone"] = clean_phone
-                        print(f"  ✓ Phone Saved: {clean_phone}")
-
-                # ---- Geography enrichment
-                broker_record["geography"] = (
-                    broker_data.get("location")
-                    or broker_record["geography"]
-                )
-
-                # ---- Industry enrichment
-                broker_record["industry_focus"] = (
-                    broker_data.get("industry_focus")
-                    or broker_record["industry_focus"]
-                )
-
-            except Exception as e:
-                print(f"  ⚠ Deep extraction error: {str(e)[:60]}")
-
-            # ---------------- VALIDATION ----------------
-            has_contact = broker_record.get("email") or broker_record.get("phone")
-            has_name = broker_record.get("broker_name") not in ["Not Available", "", None]
-
-            if has_contact or has_name:
-                extracted.append(broker_record)
-                processed += 1
-                print("  ✅ Added to Broker Database")
-            else:
-                print("  ⚠ Skipped: No useful broker data")
-
-            random_delay()
-
-        except Exception as e:
-            print(f"  ❌ Failed listing: {str(e)[:80]}")
+        done = journal.get(url)
+        if done:
+            results[i] = (*done, None)
+        else:
+            todo.append(i)
+    resumed = sum(1 for r in results if r)
+    if resumed:
+        print(f"↻ Resuming: {resumed} listings already done ({EXTRACTION_JOURNAL.name})")
+
+    # Politeness is per domain (in BrokerScraper); the scheduler hands each free
+    # worker a listing from a site that is ready now, so delays overlap
+    scheduler = schedule_by_domain(listings, todo)
+    workers = max(1, min(SCRAPING_CONFIG["extraction_workers"], len(scheduler)))
+    browsers = max(1, min(SCRAPING_CONFIG["browser_pool_size"], workers))
+    print(f"Extracting {len(scheduler)} listings with {workers} workers, {browsers} browsers")
+
+    # Browsers are launched once and reused for every listing; a worker without
+    # one waits (snapshot parses and cache hits don't need a browser)
+    with BrokerScraper(pool_size=browsers) as scraper:
+        def run():
+            while True:
+                task = scheduler.next()
+                if task is None:
+                    return
+                domain, i = task
+                try:
+                    results[i] = status, record, error = extract_listing(
+                        scraper, listings[i], f"[{i + 1}/{len(listings)}]")
+                    # Only clean results are journaled: listings with an error
+                    # (failed live page included) or a skipped site are retried next run
+                    if status in (ADDED, NO_DATA) and not error:
+                        journal.record(listings[i]["Listing URL"], status, record)
+                finally:
+                    scheduler.done(domain)
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for future in [pool.submit(run) for _ in range(workers)]:
+                future.result()
+        page_stats = dict(scraper.stats)
+    journal.close()
 
     # ---------------- FINAL STATE UPDATE ----------------
-    state["broker_database"] = extracted
-    state["processed_count"] = processed
-    state["current_stage"] = "extraction_complete"
+    done = [r for r in results if r]  # input order
+    extracted = [record for status, record, _ in done if status == ADDED]
+    processed = len(extracted)
+    skipped = sum(1 for status, _, _ in done if status == SKIPPED)
+    errors = [error for _, _, error in done if error]
 
     print(f"\n📊 Extraction Complete: {processed} brokers ready for CSV.")
-    return state
+    if skipped:
+        print(f"   ⏭ {skipped} listings skipped (circuit open)")
+    if errors:
+        print(f"   ⚠ {len(errors)} listings had errors")
+    print(f"   📄 {page_stats['snapshot_hits']} from Agent 1 snapshots, "
+          f"{page_stats['cache_hits']} from the listing cache, "
+          f"{page_stats['live_visits']} live page visits "
+          f"({page_stats['xhr_contacts']} with contacts from the reveal's JSON)")
+    PROXY_POOL.print_stats()
+    return {
+        "broker_database": extracted,
+        "processed_count": processed,
+        "skipped_count": skipped,
+        "current_index": len(done),
+        "errors": errors,
+        "current_stage": "extraction_complete",
+    }
@@ -1,47 +1,79 @@
 import pandas as pd
+import re
 from typing import Dict, List
 import sys
 from pathlib import Path
 
 # Fix imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
 
 from agent.state import AgentState
 from config.settings import INPUT_CSV, FORM_KEYWORDS
+from graph.shared.frontier import canonicalize_url
+from graph.shared.database import PipelineDB
+from graph.shared.identity import is_placeholder, name_key
 
+CONTACT_COLUMN = "Broker or Seller Contact"
 
-def filter_listings_node(state: AgentState) -> AgentState:
+
+def filter_listings_node(state: AgentState) -> dict:
     """Filter listings that need deep extraction"""
     
     print("\n" + "="*60)
     print("NODE 1: FILTERING LISTINGS")
     print("="*60)
     
-    try:
-        df = pd.read_csv(INPUT_CSV)
-        print(f"✓ Loaded {len(df)} listings from CSV")
-    except Exception as e:
-        state["errors"].append(f"Failed to read CSV: {str(e)}")
-        return state
+    # main.py already loaded the listings; the CSV is only read when run on an empty state
+    update = {}
+    all_listings = state.get("input_listings") or []
+    if not all_listings:
+        try:
+            all_listings = pd.read_csv(INPUT_CSV).to_dict('records')
+            print(f"✓ Loaded {len(all_listings)} listings from CSV")
+        except Exception as e:
+            return {"errors": [f"Failed to read CSV: {str(e)}"]}
+        update["input_listings"] = all_listings
+    
+    df = pd.DataFrame(all_listings)
+    if "Listing URL" not in df.columns:
+        df["Listing URL"] = ""
+    if CONTACT_COLUMN not in df.columns:
+        df[CONTACT_COLUMN] = ""
     
-    all_listings = df.to_dict('records')
-    state["input_listings"] = all_listings
+    # Same listing under a tracking/ordering variant of its URL
+    urls = df["Listing URL"].where(df["Listing URL"].map(lambda u: isinstance(u, str) and bool(u)), "")
+    df["Listing URL"] = urls.map(lambda u: canonicalize_url(u) if u else u)
+    duplicate = (df["Listing URL"] != "") & df["Listing URL"].duplicated()
     
-    listings_to_process = []
+    # Contact column: a name, or nothing usable (placeholder / "contact form")
+    contact = df[CONTACT_COLUMN].fillna("").astype(str).str.strip()
+    no_name = contact.map(is_placeholder) | contact.str.lower().str.contains(
+        "|".join(re.escape(k) for k in FORM_KEYWORDS), regex=True)
+    name_keys = contact.map(name_key)
+    
+    # Already resolved in the master store (by URL, or a named broker we have contacts for)
+    try:
+        with PipelineDB() as db:
+            known_urls, known_names = db.resolved_listing_urls(), db.resolved_broker_names()
+    except Exception as e:
+        print(f"⚠ Master store unavailable, nothing skipped as known: {e}")
+        known_urls, known_names = set(), set()
+    known_url = df["Listing URL"].isin(known_urls)
+    known_broker = ~no_name & name_keys.isin(known_names)
     
-    for listing in all_listings:
-        broker_contact = str(listing.get('Broker Contact', '')).lower()
-        
-        needs_extraction = any(keyword in broker_contact for keyword in FORM_KEYWORDS)
-        
-        if needs_extraction or broker_contact in ['', 'nan', 'none', 'n/a']:
-            listings_to_process.append(listing)
+    process = ~duplicate & ~known_url & ~known_broker
+    listings_to_process = df[process].to_dict('records')
     
-    state["listings_to_process"] = listings_to_process
-    state["total_listings"] = len(listings_to_process)
-    state["current_stage"] = "filtering_complete"
+    update.update({
+        "listings_to_process": listings_to_process,
+        "total_listings": len(listings_to_process),
+        "current_stage": "filtering_complete",
+    })
     
     print(f"✓ {len(listings_to_process)} listings need deep extraction")
-    print(f"✓ {len(all_listings) - len(listings_to_process)} listings have valid broker info")
+    print(f"✓ {int(duplicate.sum())} duplicate listing URLs dropped")
+    print(f"✓ {int((~duplicate & known_url).sum())} listings already resolved in the master store")
+    print(f"✓ {int((~duplicate & ~known_url & known_broker).sum())} listings by brokers already resolved")
     
-    return state
\ No newline at end of file
+    return update
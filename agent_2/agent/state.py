@@ -12,11 +12,18 @@ class BrokerRecord(TypedDict):
     geography: Optional[str]
     linkedin_search_url: Optional[str]
     source_listing_url: str
+    source_listing_urls: List[str]   # Set by deduplication when records are merged
     extraction_timestamp: str
 
 
 class AgentState(TypedDict):
-    """Main state for Broker Intelligence Agent"""
+    """
+    Main state for Broker Intelligence Agent.
+
+    Nodes return only the keys they change. Each key is replaced by the new
+    value, except `errors`, which is appended to (nodes return just their own
+    new errors).
+    """
     # Input data
     input_listings: List[Dict[str, str]]
     listings_to_process: List[Dict[str, str]]
@@ -25,8 +32,8 @@ class AgentState(TypedDict):
     current_index: int
     total_listings: int
     
-    # Broker database (cumulative)
-    broker_database: Annotated[List[BrokerRecord], add]
+    # Broker database (each stage hands on its full result)
+    broker_database: List[BrokerRecord]
     
     # Metadata
     processed_count: int
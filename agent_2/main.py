@@ -16,6 +16,7 @@ if base_dir not in sys.path:
 from agent.graph import create_broker_intelligence_graph
 from agent.state import AgentState
 from config.settings import OUTPUT_CSV
+from utils.scraper import HTTP_CACHE, LISTING_CACHE
 
 def load_input_data(file_path):
     """Pipeline se aayi hui listings.csv load karein aur columns check karein"""
@@ -83,6 +84,8 @@ def main():
         print(f" - Total Listings: {final_state['total_listings']}")
         print(f" - Brokers Successfully Extracted: {final_state['processed_count']}")
         print(f"📂 Master Database: {final_state['output_path']}")
+        HTTP_CACHE.print_stats()
+        LISTING_CACHE.print_stats("Listing cache")
         print("="*70)
         
         return final_state
@@ -0,0 +1,89 @@
+"""
+Column-at-a-time helpers for the enrichment and export nodes
+
+Each works on a whole pandas Series (one broker per row) instead of one dict
+at a time, so enriching or exporting 100k brokers is a handful of vectorized
+string operations.
+"""
+
+import os
+import sys
+from pathlib import Path
+from string import Formatter
+from typing import List
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+from config.settings import LINKEDIN_SEARCH_TEMPLATE
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from graph.shared.identity import PLACEHOLDERS
+
+# quote() for ASCII: every unsafe character -> %XX
+_SAFE = set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_.-~/")
+QUOTE_CODES = {chr(i): f"%{i:02X}" for i in range(128) if chr(i) not in _SAFE}
+
+
+def blank(series: pd.Series) -> pd.Series:
+    """True where a column has no real value (null, empty or a placeholder); checks each distinct value once"""
+    codes, uniques = pd.factorize(series)
+    placeholder = np.array([str(v).strip().lower() in PLACEHOLDERS for v in uniques.tolist()] + [True])
+    return pd.Series(placeholder[codes], index=series.index)
+
+
+def quote_series(series: pd.Series) -> pd.Series:
+    """
+    Same as quote() on every value. Each distinct value is encoded once, with
+    one replace per unsafe character that actually occurs ("%" first);
+    non-ASCII values (rare in names) go through quote() itself.
+    """
+    codes, uniques = pd.factorize(series.fillna("").astype(str))
+    values = uniques.tolist()
+    present = set("".join(values))
+
+    quoted = values
+    for char in sorted(present.intersection(QUOTE_CODES), key=lambda c: c != "%"):
+        code = QUOTE_CODES[char]
+        quoted = [v.replace(char, code) for v in quoted]
+    if any(ord(char) > 127 for char in present):
+        quoted = [q if v.isascii() else quote(v) for q, v in zip(quoted, values)]
+
+    return pd.Series(np.array(quoted + [""], dtype=object)[codes], index=series.index, dtype=object)
+
+
+def linkedin_urls(names: pd.Series, firms: pd.Series) -> pd.Series:
+    """LINKEDIN_SEARCH_TEMPLATE filled in per row ("" where there is no name)"""
+    has_name = ~blank(names)
+    fields = {
+        "name": quote_series(names.where(has_name, "")),
+        "firm": quote_series(firms.where(~blank(firms), "")),
+    }
+    url = pd.Series("", index=names.index, dtype=object)
+    for literal, field, _, _ in Formatter().parse(LINKEDIN_SEARCH_TEMPLATE):
+        url = url + literal
+        if field:
+            url = url + fields[field]
+    return url.where(has_name, "")
+
+
+def excel_safe(phones: pd.Series) -> pd.Series:
+    """Wrap phones as ="..." so Excel keeps them as text"""
+    phones = phones.fillna("").astype(str).str.strip()
+    return ('="' + phones + '"').where(phones != "", "")
+
+
+def records(df: pd.DataFrame) -> List[dict]:
+    """Rows as dicts with None for missing values (much faster than to_dict("records"))"""
+    values = df.to_numpy(dtype=object)
+    values[pd.isna(values)] = None
+    columns = list(df.columns)
+    return [dict(zip(columns, row)) for row in values.tolist()]
+
+
+def new_record_ids(count: int, prefix: str = "broker_") -> List[str]:
+    """`count` random 128-bit ids from a single os.urandom call"""
+    hexed = os.urandom(16 * count).hex()
+    return [prefix + hexed[i:i + 32] for i in range(0, 32 * count, 32)]
@@ -0,0 +1,136 @@
+"""
+Broker entity resolution
+
+Records that share a normalized email, phone or name+firm are the same broker
+(hash-index lookups, one pass). Names that differ slightly ("Jon Smith" /
+"John Smith") are compared only inside a block of the same surname and first
+initial, and only when their contact details don't contradict each other.
+Matches are joined with union-find and each group is merged into one record
+that keeps the best value of every field.
+"""
+
+import sys
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+# The keys are shared with the master store, so "same broker" means the same thing in both
+from graph.shared.identity import email_key, firm_key, is_placeholder, name_key, phone_key
+
+FUZZY_NAME_RATIO = 0.88     # SequenceMatcher ratio for two names in one block
+MAX_BLOCK = 500             # Larger blocks (very common names) only use the exact keys
+
+
+class UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+        self.size = [1] * size
+
+    def find(self, i: int) -> int:
+        root = i
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[i] != root:
+            self.parent[i], i = root, self.parent[i]
+        return root
+
+    def union(self, a: int, b: int):
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+
+
+def block_key(name: str) -> str:
+    """Surname + first initial: "John A Smith" and "Jon Smith" land together"""
+    parts = name.split()
+    return f"{parts[-1]}|{parts[0][0]}"
+
+
+def _conflict(a: Dict, b: Dict) -> bool:
+    """Both records have an email (or phone) and they differ"""
+    return any(a[k] and b[k] and a[k] != b[k] for k in ("email", "phone")) or \
+        bool(a["firm"] and b["firm"] and a["firm"] != b["firm"])
+
+
+def _best(values):
+    """Most frequent real value; the longest wins ties ("John A. Smith" over "John Smith")"""
+    real = [v for v in values if not is_placeholder(v)]
+    if not real:
+        return next((v for v in values if v is not None), None)
+    counts = Counter(real)
+    return max(counts, key=lambda v: (counts[v], len(str(v))))
+
+
+def merge_group(records: List[Dict]) -> Dict:
+    merged = dict(records[0])
+    for field in {f for r in records for f in r}:
+        if field in ("source_listing_url", "source_listing_urls", "extraction_timestamp", "record_id"):
+            continue
+        merged[field] = _best([r.get(field) for r in records])
+    # source_listing_url stays the first listing; the store links the broker to all of them
+    merged["source_listing_urls"] = list(dict.fromkeys(
+        url for r in records for url in (r.get("source_listing_urls") or [r.get("source_listing_url")])
+        if not is_placeholder(url)))
+    return merged
+
+
+def resolve_entities(records: List[Dict], fuzzy: bool = True):
+    """
+    Group duplicate broker records and merge each group.
+
+    Returns (merged records in first-seen order, number of duplicates folded in).
+    """
+    keys = [{
+        "email": email_key(r.get("email")),
+        "phone": phone_key(r.get("phone")),
+        "name": name_key(r.get("broker_name")),
+        "firm": firm_key(r.get("brokerage_firm")),
+    } for r in records]
+
+    groups = UnionFind(len(records))
+
+    # ---------------- EXACT KEYS (hash indexes) ----------------
+    index: Dict[tuple, int] = {}
+    for i, k in enumerate(keys):
+        lookups = [("email", k["email"]), ("phone", k["phone"])]
+        if k["name"]:
+            lookups.append(("name+firm", f"{k['name']}|{k['firm']}"))
+        for lookup in lookups:
+            if lookup[1] is None:
+                continue
+            first = index.setdefault(lookup, i)
+            if first != i:
+                groups.union(first, i)
+
+    # ---------------- FUZZY NAMES (within blocks) ----------------
+    if fuzzy:
+        blocks = defaultdict(list)
+        for i, k in enumerate(keys):
+            if k["name"]:
+                blocks[block_key(k["name"])].append(i)
+
+        for members in blocks.values():
+            if len(members) < 2 or len(members) > MAX_BLOCK:
+                continue
+            for x, i in enumerate(members):
+                for j in members[x + 1:]:
+                    if groups.find(i) == groups.find(j) or _conflict(keys[i], keys[j]):
+                        continue
+                    match = SequenceMatcher(None, keys[i]["name"], keys[j]["name"])
+                    if match.real_quick_ratio() >= FUZZY_NAME_RATIO and match.ratio() >= FUZZY_NAME_RATIO:
+                        groups.union(i, j)
+
+    # ---------------- MERGE ----------------
+    members = defaultdict(list)
+    for i in range(len(records)):
+        members[groups.find(i)].append(records[i])
+
+    merged = [merge_group(group) if len(group) > 1 else dict(group[0]) for group in members.values()]
+    return merged, len(records) - len(merged)
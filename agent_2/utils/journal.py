@@ -0,0 +1,82 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from graph.shared.frontier import canonicalize_url
+
+
+class ExtractionJournal:
+    """
+    Append-only JSONL log of finished listings, one line per listing:
+
+        {"url": canonical listing URL, "status": "added" | "no_data", "record": {...} | null}
+
+    Each line is flushed and fsynced as soon as its listing is done, so a run
+    that crashes at listing 480 of 500 resumes at 481: get() returns the
+    journaled result and the page is not visited again. The export node
+    clears the journal once the brokers are safely written.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._done: Dict[str, Tuple[str, Optional[dict]]] = {}
+        self._lock = threading.Lock()
+        self._file = None
+        self.load()
+
+    def load(self):
+        self._done = {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # last line cut off by the crash
+                    self._done[entry["url"]] = (entry["status"], entry.get("record"))
+        except OSError:
+            pass
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+    def get(self, url: str) -> Optional[Tuple[str, Optional[dict]]]:
+        """(status, broker_record) of a listing finished in an earlier attempt"""
+        return self._done.get(canonicalize_url(url))
+
+    def record(self, url: str, status: str, broker_record: Optional[dict]):
+        url = canonicalize_url(url)
+        line = json.dumps({"url": url, "status": status, "record": broker_record}, default=str)
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+                if self._file.tell() and self._last_byte() != b"\n":
+                    self._file.write("\n")  # close off a line cut short by a crash
+            self._file.write(line + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._done[url] = (status, broker_record)
+
+    def _last_byte(self) -> bytes:
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def clear(self):
+        """The run finished: the next one starts from scratch"""
+        self.close()
+        with self._lock:
+            self._done = {}
+            try:
+                self.path.unlink()
+            except OSError:
+                pass
@@ -0,0 +1,204 @@
+"""
+Offline broker-field extraction from one HTML snapshot
+
+Everything here works on page HTML only (no browser), so it can run on Agent 1's
+archived pages, on a live page's source taken once after the contact reveal,
+and in a worker process while the browser moves on to the next URL. Emails,
+phones, names and locations all come from one contact scan of the page.
+
+parse_contact_json() reads the same fields from the JSON a site fetched when
+its contact reveal was clicked (captured from the browser's network log).
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+from graph.shared.contacts import Candidate, best, scan
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+
+class SnapshotPage:
+    """Parsed HTML with the small part of the `sb` API the extractors use"""
+
+    class Element:
+        def __init__(self, tag):
+            self._tag = tag
+            self.text = tag.get_text(" ", strip=True)
+
+        def get_attribute(self, name):
+            value = self._tag.get(name)
+            return " ".join(value) if isinstance(value, list) else value
+
+    def __init__(self, html: str):
+        self._html = html
+        self._soup = BeautifulSoup(html, HTML_PARSER)
+
+    def get_page_source(self) -> str:
+        return self._html
+
+    def find_elements(self, selector: str):
+        return [self.Element(tag) for tag in self._soup.select(selector)]
+
+    def find_element(self, selector: str):
+        tag = self._soup.select_one(selector)
+        if tag is None:
+            raise LookupError(f"no element matches {selector}")
+        return self.Element(tag)
+
+
+# ----------------------- CLEANERS -----------------------
+
+def clean_name(name: str) -> str:
+    name = re.sub(r'^(Broker|Agent|Contact|By)[:,\s]*', '', name, flags=re.I)
+    return re.sub(r'\s+', ' ', name).strip()
+
+
+def clean_firm(firm: str) -> str:
+    firm = re.sub(r'^(Brokerage|Firm|Company)[:,\s]*', '', firm, flags=re.I)
+    return re.sub(r'\s+', ' ', firm).strip()
+
+
+# Per field: does an element's text qualify, and how to clean the value
+FIELD_RULES = {
+    "broker_name": (lambda text: " " in text and 5 < len(text) < 50, clean_name),
+    "brokerage_firm": (lambda text: 5 < len(text) < 80, clean_firm),
+    "industry_focus": (lambda text: 0 < len(text) < 50, None),
+    "location": (lambda text: 0 < len(text) < 100, None),
+}
+
+
+# ----------------------- EXTRACTORS -----------------------
+
+def apply_strategy(page: SnapshotPage, found: List[Candidate],
+                   strategy, accept) -> Optional[str]:
+    kind, spec = strategy
+    if kind == "scan":
+        return best(found, spec)
+
+    try:
+        for el in page.find_elements(spec):
+            text = el.text.strip()
+            if text and accept(text):
+                return text
+    except Exception:
+        pass
+    return None
+
+
+def extract_email(page: SnapshotPage, found: List[Candidate]) -> Optional[str]:
+    """Best-scored email from the page text or its mailto links"""
+    candidates = [c for c in found if c.kind == "email"]
+
+    # Mailto links count as contact context; start=-1 wins ties with the same address in text
+    for el in page.find_elements("a[href^='mailto:']"):
+        href = el.get_attribute("href")
+        if href:
+            mailto = scan(href.replace("mailto:", "").split("?")[0])
+            candidates += [c._replace(start=-1, score=c.score + 2) for c in mailto if c.kind == "email"]
+
+    return best(candidates, "email")
+
+
+def extract_phone(found: List[Candidate]) -> Optional[str]:
+    return best(found, "phone")
+
+
+def parse_page(html: str, plan: Dict[str, List[Tuple[str, str]]]):
+    """
+    Extract all broker fields from one HTML snapshot.
+
+    `plan` maps each field to its strategies in the order to try them (the
+    caller orders them by SelectorStats). Returns (fields, attempts) where
+    attempts lists (field, strategy, hit) for the caller to record; this
+    function keeps no state so it can run in another process.
+    """
+    page = SnapshotPage(html)
+    found = scan(html)
+    fields, attempts = {}, []
+
+    for field, strategies in plan.items():
+        accept, clean = FIELD_RULES[field]
+        fields[field] = None
+        for strategy in strategies:
+            value = apply_strategy(page, found, strategy, accept)
+            attempts.append((field, tuple(strategy), value is not None))
+            if value is not None:
+                fields[field] = clean(value) if clean else value
+                break
+
+    fields["email"] = extract_email(page, found)
+    fields["phone"] = extract_phone(found)
+    return fields, attempts
+
+
+# ----------------------- REVEAL RESPONSES (JSON) -----------------------
+
+# JSON keys (lowercase, letters and digits only) that hold a contact field
+CONTACT_KEYS = {
+    "email": {"email", "emailaddress", "contactemail", "brokeremail", "agentemail"},
+    "phone": {"phone", "phonenumber", "telephone", "tel", "mobile", "cell", "directphone",
+              "officephone", "contactphone", "brokerphone", "agentphone"},
+    "broker_name": {"brokername", "agentname", "contactname", "fullname", "displayname"},
+    "brokerage_firm": {"brokeragefirm", "brokerage", "brokeragename", "company", "companyname",
+                       "firm", "firmname", "office", "officename", "agency"},
+}
+KEY_FIELDS = {key: field for field, keys in CONTACT_KEYS.items() for key in keys}
+
+
+def _contact_objects(node):
+    """Every JSON object in `node` (depth first)"""
+    if isinstance(node, dict):
+        yield node
+        for value in node.values():
+            yield from _contact_objects(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _contact_objects(value)
+
+
+def _contact_fields(obj: dict) -> Dict[str, str]:
+    """Contact fields held directly by one JSON object, cleaned and checked"""
+    fields = {}
+    keys = {re.sub(r"[^a-z0-9]", "", str(k).lower()): v for k, v in obj.items()}
+    # A bare "name" is only a person's name next to their email or phone
+    if "name" in keys and ("email" in keys or "phone" in keys):
+        keys.setdefault("contactname", keys["name"])
+    if "firstname" in keys and "lastname" in keys:
+        keys.setdefault("fullname", f"{keys['firstname']} {keys['lastname']}")
+
+    for key, value in keys.items():
+        field = KEY_FIELDS.get(key)
+        if field is None or field in fields or not isinstance(value, (str, int)):
+            continue
+        value = str(value).strip()
+        if field == "phone":
+            digits = re.sub(r"\D", "", value)
+            value = f"+1-{digits[-10:-7]}-{digits[-7:-4]}-{digits[-4:]}" if len(digits) >= 10 else None
+        elif field == "email":
+            value = best(scan(value), "email")
+        else:
+            accept, clean = FIELD_RULES[field]
+            value = clean(value) if accept(value) else None
+        if value:
+            fields[field] = value
+    return fields
+
+
+def parse_contact_json(payloads: List) -> Dict[str, Optional[str]]:
+    """
+    Broker name, firm, email and phone from decoded JSON responses.
+
+    The object with the most contact details (email / phone) wins, so a
+    listing's own name or a site-wide support address elsewhere in the
+    payload doesn't; fields it lacks are taken from the other objects.
+    """
+    found = [f for payload in payloads for f in map(_contact_fields, _contact_objects(payload)) if f]
+    found.sort(key=lambda f: ("email" in f) + ("phone" in f), reverse=True)
+    return {field: next((f[field] for f in found if field in f), None) for field in CONTACT_KEYS}
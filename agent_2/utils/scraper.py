@@ -1,18 +1,192 @@
 from seleniumbase import SB
-from typing import Optional, Dict
-import re
+from typing import Optional, Dict, List, Tuple
+import base64
+import json
+import multiprocessing
+import sys
+import threading
 import time
 import random
-from config.settings import SCRAPING_CONFIG, EMAIL_REGEX
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from config.settings import SCRAPING_CONFIG, FIELD_STRATEGIES, SELECTOR_STATS_JSON, HTTP_CACHE_DIR, LISTING_CACHE_DIR
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from utils.page_parser import parse_page, parse_contact_json
+from utils.selector_stats import SelectorStats
+from graph.shared.frontier import url_domain
+from graph.shared.http_cache import HttpCache
+from graph.shared.metrics import recorder
+from graph.shared.proxies import ProxyPool
+from graph.shared.ratelimit import DomainRateLimiter
+from graph.shared.resilience import (
+    DomainBreakers, RetryBudget, CircuitOpenError, ChallengeError,
+    call_with_retry, is_challenge,
+)
+
+METRICS = recorder("agent_2")
+
+# Shared by every scraper in the run: a failing site is cut off, retries are capped
+BREAKERS = DomainBreakers(SCRAPING_CONFIG["breaker_failures"], SCRAPING_CONFIG["breaker_reset"])
+RETRY_BUDGET = RetryBudget(SCRAPING_CONFIG["retry_budget"])
+
+# Outbound exits for browser sessions and plain HTTP requests
+PROXY_POOL = ProxyPool.from_config(SCRAPING_CONFIG["proxies"])
+
+# What worked for each field on each domain, carried across runs
+SELECTOR_STATS = SelectorStats(SELECTOR_STATS_JSON)
+
+# Pages fetched in earlier runs (or earlier in this one) that are still fresh
+HTTP_CACHE = HttpCache(HTTP_CACHE_DIR, ttl=SCRAPING_CONFIG["cache_ttl"],
+                       max_bytes=SCRAPING_CONFIG["cache_max_mb"] * 2 ** 20)
+
+# Live listings hold what their contact reveal returned, which a replayed page
+# would not have: these entries are the parsed fields (JSON), not the HTML
+LISTING_CACHE = HttpCache(LISTING_CACHE_DIR, ttl=SCRAPING_CONFIG["cache_ttl"],
+                          max_bytes=SCRAPING_CONFIG["cache_max_mb"] * 2 ** 20)
+
+# Politeness: delay_between_requests applies per site (and exit), not globally
+RATE_LIMITER = DomainRateLimiter(delay=SCRAPING_CONFIG["delay_between_requests"])
+
+
+class BrowserSession:
+    """One long-lived UC browser (entered manually so it outlives a single URL)"""
+
+    def __init__(self, headless: bool):
+        self.egress = PROXY_POOL.acquire()
+        start = time.perf_counter()
+        # log_cdp: Chrome's performance log, where the reveal's network responses show up
+        self._context = SB(uc=True, headless=headless, log_cdp=SCRAPING_CONFIG["capture_xhr"],
+                           proxy=self.egress.sb_proxy if self.egress else None)
+        try:
+            self.sb = self._context.__enter__()
+        except Exception:
+            PROXY_POOL.release(self.egress)
+            raise
+        METRICS.record("launch", "browser", time.perf_counter() - start)
+        self.created = time.monotonic()
+        self.uses = 0
+
+    def healthy(self) -> bool:
+        """The browser still answers (driver alive, window open)"""
+        try:
+            return self.sb.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def close(self):
+        try:
+            self._context.__exit__(None, None, None)
+        except Exception:
+            pass
+        finally:
+            PROXY_POOL.release(self.egress)
+
+
+class SessionPool:
+    """
+    Up to `size` browsers reused across URLs. Sessions are health-checked when
+    taken and recycled after `max_uses` pages, `max_age` seconds, or a failure.
+    """
+
+    def __init__(self, size: int = 1, max_uses: int = 25, max_age: float = 900,
+                 headless: bool = False):
+        self.size = size
+        self.max_uses = max_uses
+        self.max_age = max_age
+        self.headless = headless
+        self._idle = []
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+
+    def _usable(self, session: BrowserSession) -> bool:
+        return (session.uses < self.max_uses
+                and time.monotonic() - session.created < self.max_age
+                and session.healthy())
+
+    def acquire(self) -> BrowserSession:
+        self._slots.acquire()
+        try:
+            while True:
+                with self._lock:
+                    session = self._idle.pop() if self._idle else None
+                if session is None:
+                    return BrowserSession(self.headless)
+                if self._usable(session):
+                    return session
+                session.close()  # recycle
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, session: BrowserSession, broken: bool = False):
+        session.uses += 1
+        if broken:
+            session.close()
+        else:
+            with self._lock:
+                self._idle.append(session)
+        self._slots.release()
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for session in idle:
+            session.close()
 
 
 class BrokerScraper:
-    """SeleniumBase UC Mode scraper for broker extraction"""
+    """
+    SeleniumBase UC Mode scraper for broker extraction.
 
-    def __init__(self):
-        self.config = SCRAPING_CONFIG
+    Browsers are pooled and reused across URLs; use it as a context manager
+    (or call close()) so they are shut down at the end.
+    """
 
-    def extract_broker_data(self, url: str) -> Dict[str, Optional[str]]:
+    def __init__(self, pool_size: Optional[int] = None):
+        self.config = SCRAPING_CONFIG
+        self.pool = SessionPool(
+            size=pool_size or self.config["browser_pool_size"],
+            max_uses=self.config["session_max_uses"],
+            max_age=self.config["session_max_age"],
+            headless=self.config["headless"],
+        )
+        self.stats = {"snapshot_hits": 0, "cache_hits": 0, "live_visits": 0, "xhr_contacts": 0}
+        self._stats_lock = threading.Lock()
+        # Per domain: index of the reveal control that works, and probes that found none
+        self.reveal_memory = {}
+        self.reveal_misses = {}
+        self._reveal_lock = threading.Lock()
+        # Page parsing runs in worker processes (0 = in the calling thread)
+        self._parser = None
+        self._parser_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.pool.close()
+        if self._parser:
+            self._parser.shutdown()
+        SELECTOR_STATS.save()
+
+    def extract_broker_data(self, url: str, snapshot: Optional[str] = None) -> Dict[str, Optional[str]]:
+        """
+        Extract broker fields for a listing.
+
+        With `snapshot` (the HTML Agent 1 captured) the page is parsed first
+        without a browser; the live page is only visited when the snapshot has
+        no email or phone, i.e. the contact details sit behind a click.
+        What a live visit found within cache_ttl is taken from LISTING_CACHE instead.
+
+        Live visits are retried. Raises CircuitOpenError (without opening a
+        browser) when the listing's site is currently cut off. When the live
+        page still fails, the snapshot's fields come back with "error" set.
+        """
         broker_data = {
             "broker_name": None,
             "brokerage_firm": None,
@@ -23,181 +197,228 @@ class BrokerScraper:
             "source_url": url,
         }
 
-        with SB(uc=True, headless=self.config["headless"]) as sb:
+        if snapshot:
             try:
-                sb.open(url)
-                sb.sleep(random.uniform(3, 5))
-
-                self._try_click_contact_button(sb)
-                sb.sleep(2)
-
-                page_source = sb.get_page_source()
-
-                broker_data["broker_name"] = self._extract_broker_name(sb, page_source)
-                broker_data["brokerage_firm"] = self._extract_brokerage_firm(sb, page_source)
-                broker_data["email"] = self._extract_email(sb, page_source)
-                broker_data["phone"] = self._extract_phone(page_source)
-                broker_data["industry_focus"] = self._extract_industry(sb, page_source)
-                broker_data["location"] = self._extract_geography(sb, page_source)
-
-                return broker_data
-
+                broker_data.update(self._parse(snapshot, url, snapshot=True))
             except Exception as e:
-                print(f"  ❌ Error: {str(e)[:60]}")
+                print(f"  ⚠ Snapshot parse error: {str(e)[:60]}")
+            if broker_data["email"] or broker_data["phone"]:
+                self._count("snapshot_hits")
                 return broker_data
 
-    # ----------------------- HELPERS -----------------------
-
-    def _try_click_contact_button(self, sb):
-        contact_selectors = [
-            "a:contains('Contact Seller')",
-            "a:contains('Contact Broker')",
-            "button:contains('Contact')",
-            "a:contains('Show Phone')",
-            "button:contains('Show Phone')",
-            "[class*='contact']",
-            "[class*='phone']",
-        ]
-
-        for selector in contact_selectors:
-            try:
-                if sb.is_element_visible(selector, timeout=1):
-                    sb.click(selector)
-                    print("  ✓ Clicked contact button")
-                    return True
-            except Exception:
-                continue
-        return False
-
-    def _extract_broker_name(self, sb, page_source: str) -> Optional[str]:
-        selectors = [
-            "[class*='broker-name']",
-            "[class*='agent-name']",
-            "[class*='contact-name']",
-        ]
-
-        for selector in selectors:
-            try:
-                for el in sb.find_elements(selector):
-                    text = el.text.strip()
-                    if text and " " in text and 5 < len(text) < 50:
-                        return self._clean_name(text)
-            except Exception:
-                continue
-
-        patterns = [
-            r'Broker[:\s]+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)',
-            r'Agent[:\s]+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)',
-            r'Listed by[:\s]+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)',
-        ]
-
-        for p in patterns:
-            m = re.search(p, page_source)
-            if m:
-                return self._clean_name(m.group(1))
-
-        return None
-
-    def _extract_brokerage_firm(self, sb, page_source: str) -> Optional[str]:
-        selectors = [
-            "[class*='brokerage']",
-            "[class*='company']",
-            "[class*='firm']",
-        ]
-
-        for selector in selectors:
+        try:
+            cached = LISTING_CACHE.lookup(url)
+            if cached and cached["fresh"]:
+                LISTING_CACHE.count("hit")
+                self._count("cache_hits")
+                live = json.loads(cached["text"])
+            else:
+                html, responses = call_with_retry(
+                    lambda: self._visit(url),
+                    url_domain(url), BREAKERS, RETRY_BUDGET,
+                    attempts=self.config["retry_attempts"], metrics=METRICS, url=url,
+                )
+                LISTING_CACHE.count("miss")
+                self._count("live_visits")
+                # The browser is already back in the pool while this page is parsed
+                live = self._parse(html, url)
+                # The reveal's own JSON beats the re-rendered page where it has a value
+                revealed = parse_contact_json(responses)
+                if any(revealed.values()):
+                    self._count("xhr_contacts")
+                    live.update({key: value for key, value in revealed.items() if value})
+                LISTING_CACHE.store(url, json.dumps(live).encode("utf-8"), "utf-8")
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            print(f"  ❌ Error: {str(e)[:60]}")
+            broker_data["error"] = str(e) or type(e).__name__
+            return broker_data
+
+        # Keep what the snapshot found where the live page came up empty
+        return {key: live.get(key) or value for key, value in broker_data.items()}
+
+    def _count(self, name: str):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def _visit(self, url: str) -> Tuple[str, List]:
+        """
+        One attempt: load the page, reveal the contact details and take a single
+        snapshot of the DOM. Returns (html, JSON responses the reveal fetched).
+        Raises on load errors and bot challenges so they can be retried.
+        """
+        domain = url_domain(url)
+
+        session = self.pool.acquire()
+        sb, egress = session.sb, session.egress
+        try:
+            METRICS.record("politeness", domain,
+                           RATE_LIMITER.wait(ProxyPool.key(domain, egress)), url=url)
             try:
-                for el in sb.find_elements(selector):
-                    text = el.text.strip()
-                    if text and 5 < len(text) < 80:
-                        return self._clean_firm(text)
+                start = time.perf_counter()
+                with METRICS.span("navigation", domain, url):
+                    sb.open(url)
+                loaded = time.perf_counter() - start
             except Exception:
-                continue
-
-        return None
-
-    def _extract_email(self, sb, page_source: str) -> Optional[str]:
-        """Improved email extraction with mailto links & filtering"""
-        emails = []
+                PROXY_POOL.report(egress, ok=False)
+                raise
+            with METRICS.span("wait", domain, url):
+                sb.sleep(random.uniform(3, 5))
+            if is_challenge(sb.get_title()):
+                PROXY_POOL.report(egress, challenge=True)
+                raise ChallengeError(f"bot challenge on {domain}")
+            PROXY_POOL.report(egress, loaded)
+
+            responses = []
+            with METRICS.span("reveal", domain, url):
+                self._network_responses(sb)  # drop the page load's entries
+                if self._try_click_contact_button(sb, domain):
+                    sb.sleep(2)
+                    responses = self._network_responses(sb)
+            html = sb.get_page_source()
+        except Exception:
+            # Don't hand a browser in an unknown state to the next URL
+            self.pool.release(session, broken=True)
+            raise
+        self.pool.release(session)
+        return html, responses
+
+    def _parse(self, html: str, url: str, snapshot: bool = False) -> Dict[str, Optional[str]]:
+        """
+        All selector/regex extraction on one HTML snapshot, off the browser.
+        Strategies are ordered by SELECTOR_STATS here and the outcomes recorded
+        here, so the parse itself is stateless and can run in another process.
+        """
+        domain = url_domain(url)
+        plan = {field: SELECTOR_STATS.order(domain, field, strategies)
+                for field, strategies in FIELD_STRATEGIES.items()}
+
+        with METRICS.span("extraction", domain, url, snapshot=snapshot):
+            parser = self._parse_pool()
+            if parser:
+                fields, attempts = parser.submit(parse_page, html, plan).result()
+            else:
+                fields, attempts = parse_page(html, plan)
+
+        for field, strategy, hit in attempts:
+            SELECTOR_STATS.record(domain, field, strategy, hit)
+        return fields
+
+    def _parse_pool(self) -> Optional[ProcessPoolExecutor]:
+        workers = self.config["parse_workers"]
+        if not workers:
+            return None
+        with self._parser_lock:
+            if self._parser is None:
+                # spawn: the scraper process runs browser threads, which fork() doesn't mix with
+                self._parser = ProcessPoolExecutor(
+                    max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._parser
 
-        # 1️⃣ Plain text emails
-        emails += re.findall(EMAIL_REGEX, page_source)
+    # ----------------------- HELPERS -----------------------
 
-        # 2️⃣ Mailto: links
+    def _network_responses(self, sb) -> List:
+        """
+        Decoded JSON bodies of the XHR / fetch responses in the browser's
+        performance log since the last call (reading the log clears it).
+        """
+        if not self.config["capture_xhr"]:
+            return []
         try:
-            mailto_links = sb.find_elements("a[href^='mailto:']")
-            for el in mailto_links:
-                href = el.get_attribute("href")
-                if href:
-                    email = href.replace("mailto:", "").split("?")[0]
-                    emails.append(email)
+            entries = sb.driver.get_log("performance")
         except Exception:
-            pass
+            return []
 
-        # 3️⃣ Filter invalid / test emails
-        emails = [e for e in emails if not any(x in e.lower() for x in ["noreply", "example.com", "test@"])]
-
-        return emails[0] if emails else None
-
-    def _extract_phone(self, page_source: str) -> Optional[str]:
-        patterns = [
-            r'\((\d{3})\)\s*(\d{3})[-\s]?(\d{4})',
-            r'(\d{3})[-.\s](\d{3})[-.\s](\d{4})',
-        ]
-
-        for p in patterns:
-            for m in re.findall(p, page_source):
-                if all(part.isdigit() for part in m):
-                    return f"+1-{m[0]}-{m[1]}-{m[2]}"
-        return None
-
-    def _extract_industry(self, sb, page_source: str) -> Optional[str]:
-        selectors = ["[class*='category']", "[class*='industry']"]
-        for selector in selectors:
+        payloads = []
+        for entry in entries:
             try:
-                el = sb.find_element(selector)
-                text = el.text.strip()
-                if text and len(text) < 50:
-                    return text
+                message = json.loads(entry["message"])["message"]
+                if message["method"] != "Network.responseReceived":
+                    continue
+                params = message["params"]
+                if params.get("type") not in ("XHR", "Fetch") or "json" not in params["response"].get("mimeType", ""):
+                    continue
+                body = sb.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": params["requestId"]})
+                text = body["body"]
+                if body.get("base64Encoded"):
+                    text = base64.b64decode(text).decode("utf-8", errors="replace")
+                payloads.append(json.loads(text))
             except Exception:
-                continue
-        return None
-
-    def _extract_geography(self, sb, page_source: str) -> Optional[str]:
-        """Robust geography: selector fallback + regex"""
-        selectors = [
-            "[class*='location']",
-            "[class*='address']",
-            "[class*='city']",
-        ]
-
-        for selector in selectors:
-            try:
-                el = sb.find_element(selector)
-                text = el.text.strip()
-                if text and len(text) < 100:
-                    return text
-            except Exception:
-                continue
-
-        # Regex fallback: City, State
-        match = re.search(r"[A-Z][a-z]+,\s?[A-Z]{2}", page_source)
-        if match:
-            return match.group(0)
-
-        return None
-
-    # ----------------------- CLEANERS -----------------------
+                continue  # not JSON, or the body is no longer available
+        return payloads
+
+    # Reveal controls, in order of preference: (CSS selector, text it must contain)
+    REVEAL_CONTROLS = [
+        ("a", "Contact Seller"),
+        ("a", "Contact Broker"),
+        ("button", "Contact"),
+        ("a", "Show Phone"),
+        ("button", "Show Phone"),
+        ("[class*='contact']", None),
+        ("[class*='phone']", None),
+    ]
+
+    # Marks the first visible match of the candidate controls; returns its index or -1
+    REVEAL_PROBE = """
+        const controls = arguments[0];
+        document.querySelectorAll('[data-reveal-probe]').forEach(el => el.removeAttribute('data-reveal-probe'));
+        for (let i = 0; i < controls.length; i++) {
+            const [css, text] = controls[i];
+            for (const el of document.querySelectorAll(css)) {
+                if (text && !(el.textContent || '').includes(text)) continue;
+                const box = el.getBoundingClientRect(), style = getComputedStyle(el);
+                if (box.width > 0 && box.height > 0 && style.visibility !== 'hidden' && style.display !== 'none') {
+                    el.setAttribute('data-reveal-probe', '1');
+                    return i;
+                }
+            }
+        }
+        return -1;
+    """
+
+    REVEAL_MISSES_BEFORE_SKIP = 3
+
+    def _try_click_contact_button(self, sb, domain: str) -> bool:
+        """
+        One in-page probe for all reveal controls instead of polling each selector.
+        Remembers per domain which control works (probed alone next time) and
+        stops probing a domain that never had one.
+        """
+        with self._reveal_lock:
+            known = self.reveal_memory.get(domain)
+            misses = self.reveal_misses.get(domain, 0)
+        if known is None and misses >= self.REVEAL_MISSES_BEFORE_SKIP:
+            return False
+
+        controls = self.REVEAL_CONTROLS
+        candidates = [controls[known]] if known is not None else controls
+        try:
+            index = sb.execute_script(self.REVEAL_PROBE, [list(c) for c in candidates])
+            if known is not None and index == -1:
+                # Remembered control not on this page: fall back to the full probe
+                candidates = controls
+                index = sb.execute_script(self.REVEAL_PROBE, [list(c) for c in candidates])
+        except Exception:
+            return False
 
-    def _clean_name(self, name: str) -> str:
-        name = re.sub(r'^(Broker|Agent|Contact|By)[:,\s]*', '', name, flags=re.I)
-        return re.sub(r'\s+', ' ', name).strip()
+        if not isinstance(index, int) or not 0 <= index < len(candidates):
+            with self._reveal_lock:
+                self.reveal_misses[domain] = misses + 1
+            return False
 
-    def _clean_firm(self, firm: str) -> str:
-        firm = re.sub(r'^(Brokerage|Firm|Company)[:,\s]*', '', firm, flags=re.I)
-        return re.sub(r'\s+', ' ', firm).strip()
+        with self._reveal_lock:
+            self.reveal_memory[domain] = controls.index(candidates[index])
+            self.reveal_misses[domain] = 0
+        try:
+            sb.click("[data-reveal-probe='1']")
+            print("  ✓ Clicked contact button")
+            return True
+        except Exception:
+            return False
 
 
-def random_delay():
+def random_delay(url: Optional[str] = None):
     delay = random.uniform(*SCRAPING_CONFIG["delay_between_requests"])
     time.sleep(delay)
+    METRICS.record("politeness", url_domain(url) if url else "agent_2", delay, url=url)
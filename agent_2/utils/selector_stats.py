@@ -0,0 +1,70 @@
+import json
+import os
+import random
+import threading
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+
+class SelectorStats:
+    """
+    Which extraction strategy (CSS selector or contact scan) produced each field on each
+    domain, persisted between runs as JSON:
+
+        {domain: {field: {"css:[class*='broker-name']": [hits, tries], ...}}}
+
+    order() puts a domain's proven strategies first, so pages on a known site
+    usually stop at the first lookup, and drops strategies that never worked
+    there after `retire_after` tries (still re-tried now and then, in case the
+    site changes).
+    """
+
+    def __init__(self, path, retire_after: int = 10, explore: float = 0.05):
+        self.path = Path(path)
+        self.retire_after = retire_after
+        self.explore = explore
+        self._stats: Dict[str, Dict[str, Dict[str, List[int]]]] = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    @staticmethod
+    def key(strategy: Tuple[str, str]) -> str:
+        kind, spec = strategy
+        return f"{kind}:{spec}"
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self._stats = json.load(f)
+        except (OSError, ValueError):
+            self._stats = {}
+
+    def save(self):
+        with self._lock:
+            data = json.dumps(self._stats, indent=2, sort_keys=True)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(data, encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def order(self, domain: str, field: str, strategies: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """Live strategies by smoothed hit rate on this domain; unknown ones keep config order"""
+        with self._lock:
+            seen = self._stats.get(domain, {}).get(field, {})
+
+            def rate(strategy):
+                hits, tries = seen.get(self.key(strategy), (0, 0))
+                return (hits + 1) / (tries + 2)
+
+            def retired(strategy):
+                hits, tries = seen.get(self.key(strategy), (0, 0))
+                return hits == 0 and tries >= self.retire_after and random.random() >= self.explore
+
+            return sorted((s for s in strategies if not retired(s)), key=rate, reverse=True)
+
+    def record(self, domain: str, field: str, strategy: Tuple[str, str], hit: bool):
+        with self._lock:
+            counts = self._stats.setdefault(domain, {}).setdefault(field, {}).setdefault(
+                self.key(strategy), [0, 0])
+            counts[0] += int(hit)
+            counts[1] += 1
@@ -4,12 +4,14 @@ from pathlib import Path
 from agent.nodes.export_html import export_html_drafts
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
 
 from agent.state import AgentState
 from config.settings import EMAIL_DRAFTS_CSV, USER_INFO  # ← FIXED
+from graph.shared.database import PipelineDB
 
 
-def export_drafts_node(state: AgentState) -> AgentState:
+def export_drafts_node(state: AgentState) -> dict:
     """Export email drafts to CSV"""
 
     print("\n" + "="*60)
@@ -20,9 +22,8 @@ def export_drafts_node(state: AgentState) -> AgentState:
 
     if not drafts:
         print("⚠ No drafts to export")
-        state["current_stage"] = "export_complete"
         export_html_drafts(state)
-        return state
+        return {"current_stage": "export_complete"}
 
     # Clean email bodies for CSV
     for draft in drafts:
@@ -46,8 +47,12 @@ def export_drafts_node(state: AgentState) -> AgentState:
     # Save with proper quoting
     df.to_csv(EMAIL_DRAFTS_CSV, index=False, quoting=1)
 
-    state["output_path"] = str(EMAIL_DRAFTS_CSV)
-    state["current_stage"] = "export_complete"
+    # Drafted brokers are not picked again by the next run's load_brokers
+    try:
+        with PipelineDB() as db:
+            db.mark_drafted(d["record_id"] for d in drafts if d.get("record_id"))
+    except Exception as e:
+        print(f"⚠ Could not mark drafted brokers in the master store: {e}")
 
     print(f"✓ Exported {len(drafts)} email drafts to:")
     print(f"  {EMAIL_DRAFTS_CSV}")
@@ -74,4 +79,4 @@ def export_drafts_node(state: AgentState) -> AgentState:
     # Export HTML
     export_html_drafts(state)
 
-    return state
\ No newline at end of file
+    return {"output_path": str(EMAIL_DRAFTS_CSV), "current_stage": "export_complete"}
\ No newline at end of file
@@ -30,7 +30,7 @@ from config.settings import USER_INFO
 # ------------------------------------------------------------------
 # NODE: GENERATE EMAILS
 # ------------------------------------------------------------------
-def generate_emails_node(state: AgentState) -> AgentState:
+def generate_emails_node(state: AgentState) -> dict:
     """Generate personalized email drafts using Gemini"""
 
     print("\n" + "=" * 60)
@@ -42,8 +42,7 @@ def generate_emails_node(state: AgentState) -> AgentState:
 
     if not brokers:
         print("⚠ No brokers in state")
-        state["current_stage"] = "emails_generated"
-        return state
+        return {"current_stage": "emails_generated"}
 
     prompts = {
         "professional": (PROFESSIONAL_SYSTEM_PROMPT, PROFESSIONAL_TEMPLATE),
@@ -59,6 +58,7 @@ def generate_emails_node(state: AgentState) -> AgentState:
     model = genai.GenerativeModel("gemini-2.5-flash")
 
     email_drafts = []
+    errors = []
     generated = 0
 
     for idx, broker in enumerate(brokers, 1):
@@ -108,6 +108,7 @@ Full email body starting with greeting and ending with a professional signature.
                 print("  ⚠ Warning: Short email body detected")
 
             email_draft: EmailDraft = {
+                "record_id": broker.get("record_id"),
                 "broker_name": broker_name,
                 "broker_firm": broker_firm,
                 "broker_email": broker_email,
@@ -124,15 +125,16 @@ Full email body starting with greeting and ending with a professional signature.
 
         except Exception as e:
             error_msg = f"Failed: {str(e)[:80]}"
-            state["errors"].append(error_msg)
+            errors.append(error_msg)
             print(f"  ❌ {error_msg}")
 
-    state["email_drafts"] = email_drafts
-    state["drafts_generated"] = generated
-    state["current_stage"] = "emails_generated"
-
     print(f"\n✓ Generated {generated} email drafts")
-    return state
+    return {
+        "email_drafts": email_drafts,
+        "drafts_generated": generated,
+        "errors": errors,
+        "current_stage": "emails_generated",
+    }
 
 
 # ------------------------------------------------------------------
@@ -3,12 +3,14 @@ import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
 
 from agent.state import AgentState
 from config.settings import BROKER_DATABASE_CSV, EMAIL_CONFIG
+from graph.shared.database import PipelineDB
 
 
-def load_brokers_node(state: AgentState) -> AgentState:
+def load_brokers_node(state: AgentState) -> dict:
     """Load broker database from Agent 2"""
     
     print("\n" + "="*60)
@@ -16,11 +18,16 @@ def load_brokers_node(state: AgentState) -> AgentState:
     print("="*60)
     
     try:
-        df = pd.read_csv(BROKER_DATABASE_CSV)
+        # Master store first (brokers not drafted for yet, oldest first);
+        # the CSV hand-off only if Agent 2 hasn't filled the store yet
+        with PipelineDB() as db:
+            stored = db.count("brokers")
+            df = db.brokers_df(undrafted=True)
+        if not stored:
+            df = pd.read_csv(BROKER_DATABASE_CSV)
         print(f"✓ Loaded {len(df)} brokers from database")
     except Exception as e:
-        state["errors"].append(f"Failed to load database: {str(e)}")
-        return state
+        return {"errors": [f"Failed to load database: {str(e)}"]}
     
     # Convert to list
     brokers = df.to_dict('records')
@@ -53,10 +60,10 @@ def load_brokers_node(state: AgentState) -> AgentState:
         print(f"⚠ Limiting to {max_emails} brokers")
         all_brokers = all_brokers[:max_emails]
     
-    state["broker_database"] = all_brokers
-    state["total_brokers"] = len(all_brokers)
-    state["current_stage"] = "brokers_loaded"
-    
     print(f"✓ Ready to generate {len(all_brokers)} email drafts")
     
-    return state
\ No newline at end of file
+    return {
+        "broker_database": all_brokers,
+        "total_brokers": len(all_brokers),
+        "current_stage": "brokers_loaded",
+    }
\ No newline at end of file
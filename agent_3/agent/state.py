@@ -4,6 +4,7 @@ from operator import add
 
 class EmailDraft(TypedDict):
     """Single email draft"""
+    record_id: Optional[str]  # broker's record_id in the master store
     broker_name: str
     broker_firm: str
     broker_email: Optional[str]
@@ -14,13 +15,18 @@ class EmailDraft(TypedDict):
 
 
 class AgentState(TypedDict):
-    """State for Email Outreach Agent"""
+    """
+    State for Email Outreach Agent.
+
+    Nodes return only the keys they change; `errors` is appended to, every
+    other key replaced.
+    """
     # Input
     broker_database: List[Dict[str, str]]
     selected_tone: str  # "professional", "relationship", "direct"
     
     # Processing
-    email_drafts: Annotated[List[EmailDraft], add]
+    email_drafts: List[EmailDraft]
     
     # Metadata
     total_brokers: int
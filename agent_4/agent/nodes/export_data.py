@@ -10,7 +10,7 @@ from agent.state import AgentState
 from config.settings import MASTER_EXCEL, MASTER_CSV, NOTION_JSON, AIRTABLE_JSON
 
 
-def export_data_node(state: AgentState) -> AgentState:
+def export_data_node(state: AgentState) -> dict:
     """Export catalog - single row per business with all data"""
 
     print("\n" + "=" * 60)
@@ -21,8 +21,7 @@ def export_data_node(state: AgentState) -> AgentState:
 
     if not records:
         print("⚠ No records to export")
-        state["current_stage"] = "export_complete"
-        return state
+        return {"current_stage": "export_complete"}
 
     export_data = []
 
@@ -69,22 +68,21 @@ def export_data_node(state: AgentState) -> AgentState:
     export_to_notion(records)
     export_to_airtable(records)
 
-    state["output_paths"] = {
-        "excel": str(MASTER_EXCEL),
-        "csv": str(MASTER_CSV),
-        "notion": str(NOTION_JSON),
-        "airtable": str(AIRTABLE_JSON)
-    }
-
-    state["current_stage"] = "export_complete"
-
     print("\n✅ Export Complete!")
     print(f"  📊 Excel: {MASTER_EXCEL}")
     print(f"  📄 CSV: {MASTER_CSV}")
     print(f"  🔗 Notion: {NOTION_JSON}")
     print(f"  🔗 Airtable: {AIRTABLE_JSON}")
 
-    return state
+    return {
+        "output_paths": {
+            "excel": str(MASTER_EXCEL),
+            "csv": str(MASTER_CSV),
+            "notion": str(NOTION_JSON),
+            "airtable": str(AIRTABLE_JSON)
+        },
+        "current_stage": "export_complete",
+    }
 
 
 def export_to_excel(df: pd.DataFrame, state: AgentState):
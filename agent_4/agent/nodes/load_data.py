@@ -3,36 +3,51 @@ import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
 
 from agent.state import AgentState
 from config.settings import LISTINGS_CSV, BROKERS_CSV, EMAILS_CSV
+from graph.shared.database import PipelineDB
 
 
-def load_data_node(state: AgentState) -> AgentState:
+def load_data_node(state: AgentState) -> dict:
     """Load and normalize data from all agents"""
 
     print("\n" + "="*60)
     print("NODE 1: LOADING DATA FROM ALL AGENTS")
     print("="*60)
 
+    # Listings and brokers of Agent 2's latest run come from the master store when
+    # Agent 2 has filled it, otherwise from the CSV hand-offs
+    try:
+        with PipelineDB() as db:
+            run = db.latest_run()
+            stored_listings, stored_brokers = db.listings_df(run_id=run), db.brokers_df(run_id=run)
+    except Exception as e:
+        print(f"⚠ Master store unavailable, using CSVs: {e}")
+        stored_listings = stored_brokers = pd.DataFrame()
+
+    update = {}
+    errors = []
+
     # -----------------------
     # Agent 1: Listings
     # -----------------------
     try:
-        df_listings = pd.read_csv(LISTINGS_CSV)
+        df_listings = stored_listings if not stored_listings.empty else pd.read_csv(LISTINGS_CSV)
         # Normalize column names
         df_listings.columns = df_listings.columns.str.strip()
-        state["listings_df"] = df_listings
+        update["listings_df"] = df_listings
         print(f"✓ Loaded {len(df_listings)} listings from Agent 1")
     except Exception as e:
-        state["errors"].append(f"Failed to load listings: {str(e)}")
-        state["listings_df"] = pd.DataFrame()
+        errors.append(f"Failed to load listings: {str(e)}")
+        update["listings_df"] = pd.DataFrame()
 
     # -----------------------
     # Agent 2: Brokers
     # -----------------------
     try:
-        df_brokers = pd.read_csv(BROKERS_CSV)
+        df_brokers = stored_brokers if not stored_brokers.empty else pd.read_csv(BROKERS_CSV)
         # Normalize column names
         df_brokers.columns = df_brokers.columns.str.strip()
         # Standardize email column
@@ -40,11 +55,11 @@ def load_data_node(state: AgentState) -> AgentState:
             df_brokers["broker_email"] = df_brokers["Email"]
         elif "email" in df_brokers.columns:
             df_brokers["broker_email"] = df_brokers["email"]
-        state["brokers_df"] = df_brokers
+        update["brokers_df"] = df_brokers
         print(f"✓ Loaded {len(df_brokers)} brokers from Agent 2")
     except Exception as e:
-        state["errors"].append(f"Failed to load brokers: {str(e)}")
-        state["brokers_df"] = pd.DataFrame()
+        errors.append(f"Failed to load brokers: {str(e)}")
+        update["brokers_df"] = pd.DataFrame()
 
     # -----------------------
     # Agent 3: Email Drafts
@@ -52,20 +67,15 @@ def load_data_node(state: AgentState) -> AgentState:
     try:
         df_emails = pd.read_csv(EMAILS_CSV)
         df_emails.columns = df_emails.columns.str.strip()
-        state["emails_df"] = df_emails
+        update["emails_df"] = df_emails
         print(f"✓ Loaded {len(df_emails)} email drafts from Agent 3")
     except Exception as e:
-        state["errors"].append(f"Failed to load emails: {str(e)}")
-        state["emails_df"] = pd.DataFrame()
+        errors.append(f"Failed to load emails: {str(e)}")
+        update["emails_df"] = pd.DataFrame()
 
     # Calculate totals
-    total = len(state.get("listings_df", pd.DataFrame())) + \
-            len(state.get("brokers_df", pd.DataFrame())) + \
-            len(state.get("emails_df", pd.DataFrame()))
-    
-    state["total_records"] = total
-    state["current_stage"] = "data_loaded"
+    total = len(update["listings_df"]) + len(update["brokers_df"]) + len(update["emails_df"])
 
     print(f"\n✓ Total catalog records: {total}")
 
-    return state
\ No newline at end of file
+    return dict(update, errors=errors, total_records=total, current_stage="data_loaded")
\ No newline at end of file
@@ -1,6 +1,14 @@
 import pandas as pd
+import numpy as np
+import sys
 import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
 from agent.state import AgentState
+from graph.shared.normalize import parse_money_series
+from utils.taggers import tag_size_series
 
 
 def safe_str(value) -> str:
@@ -12,7 +20,12 @@ def safe_str(value) -> str:
     return str(value).strip()
 
 
-def organize_data_node(state: AgentState) -> AgentState:
+def money_str(value) -> str:
+    """Normalized amount as a plain number string ("" when unknown)"""
+    return "" if pd.isna(value) else f"{value:.0f}"
+
+
+def organize_data_node(state: AgentState) -> dict:
     """Merge listings + brokers + emails into SINGLE ROWS"""
 
     print("\n" + "=" * 60)
@@ -27,6 +40,14 @@ def organize_data_node(state: AgentState) -> AgentState:
     master_records = []
     processed_urls = set()
 
+    # Money columns and size tags for the whole sheet at once
+    money = {
+        col: parse_money_series(df_listings[col]) if col in df_listings.columns
+        else pd.Series(np.nan, index=df_listings.index)
+        for col in ("Asking Price", "Revenue", "EBITDA")
+    }
+    size_tags = tag_size_series(money["Asking Price"], money["Revenue"])
+
     # -----------------------
     # ONE ROW PER LISTING (with broker + email merged)
     # -----------------------
@@ -44,7 +65,7 @@ def organize_data_node(state: AgentState) -> AgentState:
             "business_name": safe_str(row.get("Business Name")),
             "industry_tag": safe_str(row.get("Industry")),
             "geography_tag": safe_str(row.get("Location")),
-            "size_tag": "",
+            "size_tag": size_tags[idx],
             "deal_status": "Active",
             "broker_name": "",
             "broker_email": "",
@@ -58,9 +79,9 @@ def organize_data_node(state: AgentState) -> AgentState:
                 "Business Name": safe_str(row.get("Business Name")),
                 "Industry": safe_str(row.get("Industry")),
                 "Location": safe_str(row.get("Location")),
-                "Asking Price": safe_str(row.get("Asking Price")),
-                "Revenue": safe_str(row.get("Revenue")),
-                "EBITDA": safe_str(row.get("EBITDA")),
+                "Asking Price": money_str(money["Asking Price"][idx]),
+                "Revenue": money_str(money["Revenue"][idx]),
+                "EBITDA": money_str(money["EBITDA"][idx]),
                 "Years in Operation": safe_str(row.get("Years in Operation")),
                 "Listing URL": listing_url,
                 "Source": safe_str(row.get("Source")),
@@ -110,11 +131,8 @@ def organize_data_node(state: AgentState) -> AgentState:
         
         master_records.append(record)
 
-    state["catalog_records"] = master_records
-    state["current_stage"] = "data_organized"
-
     print(f"✓ Organized {len(master_records)} merged records")
     print(f"  - Each row contains: Listing + Broker + Email data")
     print("✓ Single row per business")
 
-    return state
\ No newline at end of file
+    return {"catalog_records": master_records, "current_stage": "data_organized"}
\ No newline at end of file
@@ -2,7 +2,7 @@ import pandas as pd
 from agent.state import AgentState
 
 
-def tag_data_node(state: AgentState) -> AgentState:
+def tag_data_node(state: AgentState) -> dict:
     """Pass through - just forward DataFrames to organize node"""
     
     print("\n" + "=" * 60)
@@ -24,12 +24,12 @@ def tag_data_node(state: AgentState) -> AgentState:
     print(f"✓ Tagged {brokers_count} brokers")
     print(f"✓ Tagged {emails_count} email drafts")
     
-    state["tag_summary"] = {"Industries": {}, "Sizes": {}, "Geographies": {}}
-    state["current_stage"] = "data_tagged"
-    
     print(f"\n📊 Tag Summary:")
     print(f"  Industries: 0")
     print(f"  Sizes: 0")
     print(f"  Geographies: 0")
     
-    return state
\ No newline at end of file
+    return {
+        "tag_summary": {"Industries": {}, "Sizes": {}, "Geographies": {}},
+        "current_stage": "data_tagged",
+    }
\ No newline at end of file
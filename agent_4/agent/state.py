@@ -16,7 +16,12 @@ class CatalogRecord(TypedDict):
 
 
 class AgentState(TypedDict, total=False):
-    """State for Data Catalog Agent"""
+    """
+    State for Data Catalog Agent.
+
+    Nodes return only the keys they change; `errors` is appended to, every
+    other key replaced.
+    """
     # Input data - DataFrames from load_data_node
     listings_df: Any  # pd.DataFrame
     brokers_df: Any   # pd.DataFrame
@@ -28,7 +33,7 @@ class AgentState(TypedDict, total=False):
     emails_data: List[Dict]
     
     # Processed
-    catalog_records: Annotated[List[CatalogRecord], add]
+    catalog_records: List[CatalogRecord]
     
     # Tags summary
     tag_summary: Dict[str, int]
@@ -1,6 +1,15 @@
 import re
+import sys
+from pathlib import Path
 from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
 from config.settings import INDUSTRY_TAGS, SIZE_TAGS
+from graph.shared.normalize import parse_money, parse_money_series
 
 
 def tag_industry(business_name: str, industry: str) -> str:
@@ -32,6 +41,16 @@ def tag_size(asking_price: str, revenue: str) -> str:
     return "unknown"
 
 
+def tag_size_series(asking_price: pd.Series, revenue: pd.Series) -> pd.Series:
+    """Vectorized tag_size() for whole columns"""
+    amount = parse_money_series(asking_price)
+    amount = amount.where(amount > 0, parse_money_series(revenue)).fillna(0)
+
+    conditions = [(amount >= low) & (amount < high) for low, high in SIZE_TAGS.values()]
+    tags = np.select(conditions, list(SIZE_TAGS), default="unknown")
+    return pd.Series(tags, index=asking_price.index)
+
+
 def tag_geography(location: str) -> str:
     """Extract and tag geography"""
     
@@ -65,15 +84,5 @@ def tag_deal_status(record_type: str) -> str:
 
 
 def extract_number(value: str) -> Optional[float]:
-    """Extract numeric value from string"""
-    
-    if not value or value in ["Not Specified", "N/A", "nan"]:
-        return None
-    
-    # Remove $ and commas
-    clean = re.sub(r'[$,]', '', str(value))
-    
-    try:
-        return float(clean)
-    except:
-        return None
\ No newline at end of file
+    """Extract numeric value from string ($, commas, K/M suffixes, ranges -> low end)"""
+    return parse_money(value)
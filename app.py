@@ -122,6 +122,19 @@ def copy_file(source, dest):
         log(f"❌ Copy error: {str(e)}")
         return False
 
+def copy_dir(source, dest):
+    """Copy a folder's contents into destination (missing source is fine)"""
+    try:
+        source_path = Path(source)
+        if source_path.exists():
+            shutil.copytree(source_path, Path(dest), dirs_exist_ok=True)
+            log(f"✓ Copied {source_path.name}/")
+            return True
+        return False
+    except Exception as e:
+        log(f"❌ Copy error: {str(e)}")
+        return False
+
 def update_agent1_config(num_listings):
     """Update Agent 1 config with number of listings"""
     try:
@@ -374,6 +387,7 @@ if st.session_state.pipeline_running and st.session_state.pipeline_params:
         agent1_input = f"{num_listings}\n"
         if run_agent(1, "agent_1", "Agent 1: Business Listing Scraper", input_text=agent1_input, skip_status_update=True):
             copy_file("agent_1/output/listings.csv", "agent_2/input/listings.csv")
+            copy_dir("agent_1/output/pages", "agent_2/input/pages")
             st.session_state.pipeline_step = 2
             st.rerun()
         else:
@@ -0,0 +1,176 @@
+"""
+Async HTTP crawl engine for pages that don't need JavaScript
+
+Hundreds of requests in flight over one pooled aiohttp session, capped per
+host, paced by an optional DomainRateLimiter and optionally spread across a
+ProxyPool (pacing is then per host and exit). With an HttpCache, fresh
+responses are served from disk and stale ones revalidated (304). Each
+response can be handed to an existing parsing function (`parse(url, text)`),
+which runs in a thread so parsing never stalls the event loop.
+"""
+
+import asyncio
+import gzip
+import time
+import xml.etree.ElementTree as ET
+from typing import Callable, Dict, Iterable, List, Optional
+
+import aiohttp
+
+from graph.shared.frontier import url_domain
+from graph.shared.http_cache import HttpCache
+from graph.shared.ratelimit import DomainRateLimiter
+from graph.shared.proxies import ProxyPool
+from graph.shared.resilience import is_challenge
+
+
+DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+
+class AsyncCrawler:
+    """Concurrent fetcher with per-host connection limits"""
+
+    def __init__(self, concurrency: int = 200, per_host: int = 8, timeout: float = 10,
+                 rate_limiter: Optional[DomainRateLimiter] = None,
+                 headers: Optional[Dict[str, str]] = None,
+                 proxy_pool: Optional[ProxyPool] = None,
+                 cache: Optional[HttpCache] = None):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.headers = headers or DEFAULT_HEADERS
+        self.proxy_pool = proxy_pool
+        self.cache = cache
+
+    def _session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.per_host)
+        return aiohttp.ClientSession(
+            connector=connector,
+            headers=self.headers,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+
+    async def fetch(self, session: aiohttp.ClientSession, url: str) -> Dict:
+        """GET one URL. Never raises: failures come back in result["error"]."""
+        result = {"url": url, "status": None, "content": b"", "text": "", "error": None, "elapsed": 0.0}
+
+        cached = self.cache.lookup(url) if self.cache else None
+        if cached and cached["fresh"]:
+            self.cache.count("hit")
+            return dict(result, status=200, content=cached["content"], text=cached["text"], cached="hit")
+
+        egress = self.proxy_pool.acquire() if self.proxy_pool else None
+        try:
+            if self.rate_limiter:
+                await self.rate_limiter.acquire(ProxyPool.key(url_domain(url), egress))
+
+            start = time.monotonic()
+            try:
+                async with session.get(url, proxy=egress.url if egress else None,
+                                       headers=HttpCache.validators(cached)) as response:
+                    result["status"] = response.status
+                    result["content"] = await response.read()
+                    if response.status == 304 and cached:
+                        # Unchanged since we stored it
+                        self.cache.revalidated(url, cached)
+                        self.cache.count("revalidated")
+                        result.update(status=200, content=cached["content"], cached="revalidated")
+                        result["text"] = cached["text"]
+                    else:
+                        encoding = response.get_encoding() or "utf-8"
+                        result["text"] = result["content"].decode(encoding, errors="replace")
+                        if self.cache:
+                            self.cache.count("miss")
+                            # A bot challenge also comes back as 200: never serve it as the page
+                            if response.status == 200 and not is_challenge(result["text"]):
+                                self.cache.store(url, result["content"], encoding,
+                                                 response.headers.get("ETag"),
+                                                 response.headers.get("Last-Modified"))
+            except Exception as e:
+                result["error"] = f"{type(e).__name__}: {e}"
+            result["elapsed"] = time.monotonic() - start
+        finally:
+            if self.proxy_pool:
+                self.proxy_pool.release(egress)
+
+        if egress:
+            challenge = result["status"] in (403, 429) or is_challenge(result["text"])
+            ok = result["error"] is None and result["status"] is not None and result["status"] < 500
+            self.proxy_pool.report(egress, result["elapsed"], ok=ok, challenge=challenge)
+            result["proxy"] = egress.name
+        return result
+
+    async def crawl(self, urls: Iterable[str], parse: Optional[Callable] = None) -> List[Dict]:
+        """
+        Fetch every URL concurrently; results come back in input order.
+
+        If `parse` is given, result["data"] = parse(url, text) for 200 responses.
+        """
+        urls = list(urls)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async with self._session() as session:
+            async def run(url):
+                async with semaphore:
+                    result = await self.fetch(session, url)
+                if parse and result["status"] == 200:
+                    try:
+                        result["data"] = await asyncio.to_thread(parse, url, result["text"])
+                    except Exception as e:
+                        result["error"] = f"parse failed: {e}"
+                return result
+
+            return await asyncio.gather(*(run(url) for url in urls))
+
+
+def crawl(urls: Iterable[str], parse: Optional[Callable] = None, **kwargs) -> List[Dict]:
+    """Synchronous entry point for the agents (which are not async)"""
+    return asyncio.run(AsyncCrawler(**kwargs).crawl(urls, parse))
+
+
+# ----------------------- SITEMAPS -----------------------
+
+def parse_sitemap(content: bytes):
+    """Return (child_sitemaps, page_urls) from a sitemap or sitemap index"""
+    if content[:2] == b"\x1f\x8b":
+        content = gzip.decompress(content)
+
+    root = ET.fromstring(content)
+    locs = [el.text.strip() for el in root.iter() if el.tag.endswith("loc") and el.text]
+
+    if root.tag.endswith("sitemapindex"):
+        return locs, []
+    return [], locs
+
+
+def fetch_sitemap_urls(sitemap_urls: Iterable[str], contains: Optional[str] = None,
+                       max_urls: Optional[int] = None, max_depth: int = 3, **kwargs) -> List[str]:
+    """
+    Expand sitemap indexes level by level (each level fetched concurrently)
+    and return page URLs, optionally only those containing `contains`.
+    """
+    crawler = AsyncCrawler(**kwargs)
+    pending, pages, seen = list(sitemap_urls), [], set()
+
+    for _ in range(max_depth):
+        pending = [u for u in pending if u not in seen]
+        if not pending or (max_urls and len(pages) >= max_urls):
+            break
+        seen.update(pending)
+
+        children = []
+        for result in asyncio.run(crawler.crawl(pending)):
+            if result["status"] != 200:
+                print(f"   ⚠ Sitemap {result['url'][:60]}: {result['error'] or result['status']}")
+                continue
+            try:
+                child_maps, urls = parse_sitemap(result["content"])
+            except ET.ParseError as e:
+                print(f"   ⚠ Bad sitemap {result['url'][:60]}: {e}")
+                continue
+            children.extend(child_maps)
+            pages.extend(u for u in urls if not contains or contains in u)
+        pending = children
+
+    return pages[:max_urls] if max_urls else pages
@@ -0,0 +1,260 @@
+"""
+Persistent broker / listing store shared by the agents
+
+One SQLite file (PIPELINE_DB, default data/pipeline.db at the repo root) keeps
+every broker and listing across runs:
+
+    brokers          one row per broker, matched on email, then phone, then name+firm
+    listings         one row per canonical listing URL (full Agent 1 row as JSON)
+    broker_listings  which broker was found on which listing
+
+Agent 2 upserts what it extracted, Agents 3 and 4 read from here instead of
+re-parsing the CSV hand-offs. Upserts never overwrite a real value with a
+placeholder ("Not Available", "Independent", "" ...), so what an earlier run
+found survives a worse page later.
+
+Rows carry the pipeline run (metrics.run_id) that last saw them, so readers
+take one run's brokers and listings rather than the whole history; Agent 3
+also marks the brokers it has drafted an email for (drafted_at).
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from graph.shared.frontier import canonicalize_url
+from graph.shared.identity import broker_key, email_key, is_placeholder, phone_key
+
+DB_PATH = Path(os.environ.get("PIPELINE_DB") or Path(__file__).resolve().parents[2] / "data" / "pipeline.db")
+
+BROKER_FIELDS = [
+    "record_id", "broker_name", "brokerage_firm", "email", "email_source", "phone",
+    "geography", "industry_focus", "linkedin_search_url", "source_listing_url",
+    "extraction_timestamp",
+]
+
+# Agent 1 columns kept as indexed columns (the full row is in `data`)
+LISTING_COLUMNS = {
+    "Business Name": "business_name",
+    "Source": "source",
+    "Broker or Seller Contact": "broker_contact",
+}
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS brokers (
+    id INTEGER PRIMARY KEY,
+    record_id TEXT, broker_name TEXT, brokerage_firm TEXT, email TEXT, email_source TEXT,
+    phone TEXT, geography TEXT, industry_focus TEXT, linkedin_search_url TEXT,
+    source_listing_url TEXT, extraction_timestamp TEXT,
+    email_key TEXT, phone_key TEXT, name_key TEXT,
+    first_seen TEXT NOT NULL, last_seen TEXT NOT NULL,
+    run_id TEXT, drafted_at TEXT
+);
+CREATE INDEX IF NOT EXISTS brokers_email ON brokers(email_key);
+CREATE INDEX IF NOT EXISTS brokers_phone ON brokers(phone_key);
+CREATE INDEX IF NOT EXISTS brokers_name ON brokers(name_key);
+CREATE INDEX IF NOT EXISTS brokers_run ON brokers(run_id);
+
+CREATE TABLE IF NOT EXISTS listings (
+    url TEXT PRIMARY KEY,
+    business_name TEXT, source TEXT, broker_contact TEXT,
+    data TEXT NOT NULL,
+    first_seen TEXT NOT NULL, last_seen TEXT NOT NULL,
+    run_id TEXT
+);
+CREATE INDEX IF NOT EXISTS listings_source ON listings(source);
+CREATE INDEX IF NOT EXISTS listings_run ON listings(run_id);
+
+CREATE TABLE IF NOT EXISTS broker_listings (
+    broker_id INTEGER NOT NULL REFERENCES brokers(id),
+    listing_url TEXT NOT NULL REFERENCES listings(url),
+    PRIMARY KEY (broker_id, listing_url)
+);
+CREATE INDEX IF NOT EXISTS broker_listings_url ON broker_listings(listing_url);
+"""
+
+
+class PipelineDB:
+    """SQLite connection with the upsert / bulk APIs the agents use"""
+
+    def __init__(self, path=None):
+        self.path = Path(path or DB_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    # ---------------- LISTINGS ----------------
+
+    def upsert_listings(self, rows: Iterable[Dict], run_id: Optional[str] = None) -> int:
+        """Insert or refresh listings (keyed by canonical URL) in one transaction"""
+        now = datetime.now().isoformat()
+        params = []
+        for row in rows:
+            url = row.get("Listing URL")
+            if is_placeholder(url):
+                continue
+            row = {k: (None if v != v else v) for k, v in row.items()}  # NaN -> null
+            params.append((
+                canonicalize_url(url),
+                *(row.get(col) for col in LISTING_COLUMNS),
+                json.dumps(row, default=str),
+                now, now, run_id,
+            ))
+
+        with self._lock, self.conn:
+            self.conn.executemany("""
+                INSERT INTO listings (url, business_name, source, broker_contact, data, first_seen, last_seen, run_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    business_name = excluded.business_name, source = excluded.source,
+                    broker_contact = excluded.broker_contact, data = excluded.data,
+                    last_seen = excluded.last_seen, run_id = COALESCE(excluded.run_id, listings.run_id)
+            """, params)
+        return len(params)
+
+    # ---------------- BROKERS ----------------
+
+    def _match(self, keys: Dict) -> Optional[sqlite3.Row]:
+        for column in ("email_key", "phone_key", "name_key"):
+            if keys[column]:
+                row = self.conn.execute(
+                    f"SELECT * FROM brokers WHERE {column} = ? LIMIT 1", (keys[column],)).fetchone()
+                if row:
+                    return row
+        return None
+
+    def upsert_brokers(self, records: Iterable[Dict], run_id: Optional[str] = None) -> List[int]:
+        """
+        Insert new brokers and fill in known ones, in one transaction.
+
+        A record matches an existing broker on email, then phone, then
+        name+firm. Real values replace older ones; placeholders never do.
+        Brokers are linked to their source_listing_url (every one of
+        source_listing_urls for a merged broker), and every broker upserted
+        is tagged with `run_id` (when given).
+        Returns the broker id of every record, in order.
+        """
+        now = datetime.now().isoformat()
+        ids = []
+
+        with self._lock, self.conn:
+            for record in records:
+                values = {f: record.get(f) for f in BROKER_FIELDS}
+                values = {f: (None if v != v else v) for f, v in values.items()}  # NaN -> null
+                row = self._match({
+                    "email_key": email_key(values["email"]),
+                    "phone_key": phone_key(values["phone"]),
+                    "name_key": broker_key(values["broker_name"], values["brokerage_firm"]),
+                })
+
+                if row:
+                    for f in BROKER_FIELDS:
+                        if is_placeholder(values[f]) or f == "record_id" and row[f]:
+                            values[f] = row[f]
+                keys = (email_key(values["email"]), phone_key(values["phone"]),
+                        broker_key(values["broker_name"], values["brokerage_firm"]))
+
+                if row:
+                    self.conn.execute(
+                        f"UPDATE brokers SET {', '.join(f'{f} = ?' for f in BROKER_FIELDS)}, "
+                        "email_key = ?, phone_key = ?, name_key = ?, last_seen = ?, "
+                        "run_id = COALESCE(?, run_id) WHERE id = ?",
+                        (*values.values(), *keys, now, run_id, row["id"]))
+                    broker_id = row["id"]
+                else:
+                    broker_id = self.conn.execute(
+                        f"INSERT INTO brokers ({', '.join(BROKER_FIELDS)}, email_key, phone_key, name_key, "
+                        f"first_seen, last_seen, run_id) VALUES ({', '.join('?' * (len(BROKER_FIELDS) + 6))})",
+                        (*values.values(), *keys, now, now, run_id)).lastrowid
+                ids.append(broker_id)
+
+                # A merged broker carries every listing it was found on
+                urls = record.get("source_listing_urls") or [record.get("source_listing_url")]
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO broker_listings (broker_id, listing_url) VALUES (?, ?)",
+                    [(broker_id, canonicalize_url(url)) for url in urls if not is_placeholder(url)])
+        return ids
+
+    def resolved_listing_urls(self) -> Set[str]:
+        """Listings already linked to a broker with an email or phone"""
+        with self._lock:
+            return {row[0] for row in self.conn.execute("""
+                SELECT DISTINCT bl.listing_url FROM broker_listings bl
+                JOIN brokers b ON b.id = bl.broker_id
+                WHERE b.email_key IS NOT NULL OR b.phone_key IS NOT NULL
+            """)}
+
+    def resolved_broker_names(self) -> Set[str]:
+        """Normalized names (see identity.name_key) of brokers that already have an email or phone"""
+        with self._lock:
+            return {row[0].split("|")[0] for row in self.conn.execute("""
+                SELECT DISTINCT name_key FROM brokers
+                WHERE name_key IS NOT NULL AND (email_key IS NOT NULL OR phone_key IS NOT NULL)
+            """)}
+
+    def mark_drafted(self, record_ids: Iterable[str]):
+        """Agent 3 has written an email draft for these brokers"""
+        now = datetime.now().isoformat()
+        with self._lock, self.conn:
+            self.conn.executemany("UPDATE brokers SET drafted_at = ? WHERE record_id = ?",
+                                  ((now, record_id) for record_id in record_ids))
+
+    def latest_run(self) -> Optional[str]:
+        """Most recent run that wrote listings or brokers (run ids sort by time)"""
+        with self._lock:
+            return self.conn.execute("""
+                SELECT MAX(run_id) FROM (SELECT run_id FROM brokers UNION ALL SELECT run_id FROM listings)
+            """).fetchone()[0]
+
+    def count(self, table: str) -> int:
+        with self._lock:
+            return self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    # ---------------- READS (pandas) ----------------
+
+    def brokers_df(self, run_id: Optional[str] = None, undrafted: bool = False):
+        """
+        Brokers with the Master_Broker_Database.csv columns: those of one run
+        (`run_id`), those Agent 3 has not drafted an email for (`undrafted`),
+        or all of them.
+        """
+        import pandas as pd
+        where, params = [], []
+        if run_id is not None:
+            where.append("run_id = ?")
+            params.append(run_id)
+        if undrafted:
+            where.append("drafted_at IS NULL")
+        sql = f"SELECT {', '.join(BROKER_FIELDS)} FROM brokers"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        with self._lock:
+            return pd.read_sql_query(sql + " ORDER BY id", self.conn, params=params)
+
+    def listings_df(self, run_id: Optional[str] = None):
+        """Listings (of one run, or all) with Agent 1's listings.csv columns"""
+        import pandas as pd
+        sql, params = "SELECT data FROM listings", ()
+        if run_id is not None:
+            sql, params = sql + " WHERE run_id = ?", (run_id,)
+        with self._lock:
+            rows = [json.loads(data) for (data,) in self.conn.execute(sql + " ORDER BY rowid", params)]
+        return pd.DataFrame(rows)
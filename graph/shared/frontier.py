@@ -0,0 +1,204 @@
+"""
+URL frontier shared by the agents
+
+- canonicalize_url(): one spelling per listing (tracking params, fragments, host case)
+- BloomFilter: compact on-disk history of URLs seen in earlier runs
+- URLFrontier: in-memory set for the current run, backed by the Bloom history,
+  with one priority queue per domain
+"""
+
+import hashlib
+import heapq
+import math
+import os
+import threading
+from collections import deque
+from itertools import count
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+
+# Query parameters that never change which listing a URL points to
+TRACKING_PARAMS = {
+    "gclid", "gclsrc", "dclid", "fbclid", "msclkid", "yclid", "igshid",
+    "mc_cid", "mc_eid", "_ga", "_gl", "ref", "referrer", "source", "src",
+    "cmpid", "campaign", "sessionid", "sid",
+}
+TRACKING_PREFIXES = ("utm_", "pk_", "hsa_")
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize a URL so tracking/ordering variants of one listing compare equal"""
+    url = url.strip()
+    parts = urlsplit(url)
+    if not parts.scheme or not parts.netloc:
+        return url
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+
+    path = parts.path or "/"
+    while "//" in path:
+        path = path.replace("//", "/")
+
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PREFIXES)
+    ]
+    query.sort()
+
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+def url_domain(url: str) -> str:
+    """Host without a leading www. - the unit for per-domain queues"""
+    host = (urlsplit(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter persisted as a flat bit array"""
+
+    MAGIC = b"BLM1"
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key: str):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def save(self, path):
+        """Write atomically so a crash never leaves a truncated history"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(self.MAGIC)
+            f.write(self.size.to_bytes(8, "little"))
+            f.write(self.hashes.to_bytes(4, "little"))
+            f.write(self.bits)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path, capacity: int = 1_000_000, error_rate: float = 0.001) -> "BloomFilter":
+        """Load a saved filter, or start an empty one if the file is missing/invalid"""
+        bloom = cls(capacity, error_rate)
+        path = Path(path)
+        if not path.exists():
+            return bloom
+
+        data = path.read_bytes()
+        if data[:4] != cls.MAGIC:
+            print(f"⚠ Ignoring invalid URL history: {path}")
+            return bloom
+
+        bloom.size = int.from_bytes(data[4:12], "little")
+        bloom.hashes = int.from_bytes(data[12:16], "little")
+        bloom.bits = bytearray(data[16:])
+        return bloom
+
+
+class URLFrontier:
+    """
+    Canonical URL set + per-domain priority queues.
+
+    Lower priority values are popped first. URLs already recorded in the
+    on-disk history are queued one priority level lower (or dropped when
+    skip_history=True), so new listings come out first. pop() rotates over
+    domains so one site never monopolizes the queue. Thread-safe.
+    """
+
+    def __init__(self, history_path=None, skip_history: bool = False,
+                 capacity: int = 1_000_000, error_rate: float = 0.001):
+        self.history_path = Path(history_path) if history_path else None
+        self.skip_history = skip_history
+        self.history = (
+            BloomFilter.load(self.history_path, capacity, error_rate)
+            if self.history_path else BloomFilter(capacity, error_rate)
+        )
+        self._seen = set()
+        self._queues = {}
+        self._ready = deque()
+        self._seq = count()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def __contains__(self, url: str) -> bool:
+        return canonicalize_url(url) in self._seen
+
+    def seen_before(self, url: str) -> bool:
+        """True if the URL was marked done in an earlier run (may be a false positive)"""
+        return canonicalize_url(url) in self.history
+
+    def add(self, url: Optional[str], priority: int = 0) -> bool:
+        """Queue a URL. Returns False for duplicates (this run) and skipped history."""
+        if not url:
+            return False
+        url = canonicalize_url(url)
+
+        with self._lock:
+            if url in self._seen:
+                return False
+            self._seen.add(url)
+
+            if url in self.history:
+                if self.skip_history:
+                    return False
+                priority += 1
+
+            domain = url_domain(url)
+            queue = self._queues.setdefault(domain, [])
+            if not queue:
+                self._ready.append(domain)
+            heapq.heappush(queue, (priority, next(self._seq), url))
+            return True
+
+    def pop(self) -> Optional[str]:
+        """Next URL of the next domain in rotation"""
+        with self._lock:
+            if not self._ready:
+                return None
+            domain = self._ready.popleft()
+            queue = self._queues[domain]
+            url = heapq.heappop(queue)[2]
+            if queue:
+                self._ready.append(domain)
+            return url
+
+    def drain(self, limit: Optional[int] = None) -> list:
+        """Pop up to `limit` URLs (all by default)"""
+        urls = []
+        while limit is None or len(urls) < limit:
+            url = self.pop()
+            if url is None:
+                break
+            urls.append(url)
+        return urls
+
+    def mark_done(self, url: str):
+        """Record a URL in the long-term history"""
+        with self._lock:
+            self.history.add(canonicalize_url(url))
+
+    def save(self):
+        if self.history_path:
+            with self._lock:
+                self.history.save(self.history_path)
@@ -0,0 +1,157 @@
+"""
+On-disk HTTP response cache
+
+Keyed by canonical URL; one gzipped body and one small JSON header file per
+entry. Entries younger than `ttl` are served without a request. Older ones
+are revalidated with If-None-Match / If-Modified-Since, so an unchanged page
+costs a 304 instead of a download. The directory is kept under `max_bytes` by
+evicting least-recently-used entries (access time = body file mtime).
+
+Used by AsyncCrawler (cache=...), and by Agent 2 for the fields parsed from
+live listing pages (the body is then JSON rather than a page).
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from graph.shared.frontier import canonicalize_url
+
+
+class HttpCache:
+    def __init__(self, directory, ttl: float = 24 * 3600, max_bytes: int = 200 * 2 ** 20):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.counts = {"hit": 0, "revalidated": 0, "miss": 0}
+        self._lock = threading.Lock()
+
+        # key -> [size, last access]; rebuilt from the directory once
+        self._index: Dict[str, list] = {}
+        for body in self.directory.glob("*.gz"):
+            st = body.stat()
+            self._index[body.stem] = [st.st_size, st.st_mtime]
+        self._bytes = sum(size for size, _ in self._index.values())
+
+    @staticmethod
+    def key(url: str) -> str:
+        return hashlib.sha1(canonicalize_url(url).encode("utf-8")).hexdigest()[:24]
+
+    def _paths(self, key: str):
+        return self.directory / f"{key}.gz", self.directory / f"{key}.json"
+
+    # ---------------- READ ----------------
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """Cached entry (with "text" and "fresh") or None"""
+        key = self.key(url)
+        body, meta = self._paths(key)
+        try:
+            headers = json.loads(meta.read_text(encoding="utf-8"))
+            with gzip.open(body, "rb") as f:
+                content = f.read()
+        except (OSError, ValueError, EOFError):
+            return None
+
+        now = time.time()
+        try:
+            os.utime(body, (now, now))
+        except OSError:
+            pass
+        with self._lock:
+            if key in self._index:
+                self._index[key][1] = now
+
+        headers["content"] = content
+        headers["text"] = content.decode(headers.get("encoding") or "utf-8", errors="replace")
+        headers["fresh"] = now - headers["stored_at"] < self.ttl
+        return headers
+
+    @staticmethod
+    def validators(entry: Optional[Dict]) -> Dict[str, str]:
+        """Conditional request headers for a stale entry"""
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    # ---------------- WRITE ----------------
+
+    def store(self, url: str, content: bytes, encoding: Optional[str] = None,
+              etag: Optional[str] = None, last_modified: Optional[str] = None):
+        key = self.key(url)
+        body, meta = self._paths(key)
+        tmp = body.with_suffix(".tmp")
+        with gzip.open(tmp, "wb", compresslevel=5) as f:
+            f.write(content)
+        os.replace(tmp, body)
+        self._write_meta(meta, {
+            "url": url, "encoding": encoding, "etag": etag,
+            "last_modified": last_modified, "stored_at": time.time(),
+        })
+
+        size = body.stat().st_size
+        with self._lock:
+            old = self._index.get(key, [0, 0])[0]
+            self._index[key] = [size, time.time()]
+            self._bytes += size - old
+        self._evict()
+
+    def revalidated(self, url: str, entry: Dict):
+        """A 304 came back: the entry is fresh again for another ttl"""
+        _, meta = self._paths(self.key(url))
+        headers = {k: entry.get(k) for k in ("url", "encoding", "etag", "last_modified")}
+        self._write_meta(meta, dict(headers, stored_at=time.time()))
+
+    @staticmethod
+    def _write_meta(path: Path, headers: Dict):
+        tmp = path.with_suffix(".jtmp")
+        tmp.write_text(json.dumps(headers), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def _evict(self):
+        """Drop least-recently-used entries until the cache is back under 90% of max_bytes"""
+        with self._lock:
+            if self._bytes <= self.max_bytes:
+                return
+            victims = []
+            for key, (size, _) in sorted(self._index.items(), key=lambda item: item[1][1]):
+                if self._bytes <= self.max_bytes * 0.9:
+                    break
+                victims.append(key)
+                self._bytes -= size
+                del self._index[key]
+        for key in victims:
+            for path in self._paths(key):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    # ---------------- STATS ----------------
+
+    def count(self, outcome: str):
+        """Record "hit" (served fresh), "revalidated" (304) or "miss" (downloaded)"""
+        with self._lock:
+            self.counts[outcome] += 1
+
+    @property
+    def hit_rate(self) -> float:
+        total = sum(self.counts.values())
+        return (self.counts["hit"] + self.counts["revalidated"]) / total if total else 0.0
+
+    def print_stats(self, label: str = "HTTP cache"):
+        if not sum(self.counts.values()):
+            return
+        c = self.counts
+        print(f"   🗄 {label}: {self.hit_rate:.0%} hit rate "
+              f"({c['hit']} fresh, {c['revalidated']} revalidated, {c['miss']} downloaded; "
+              f"{len(self._index)} entries, {self._bytes / 2 ** 20:.1f} MB)")
@@ -0,0 +1,66 @@
+"""
+Broker identity keys
+
+The one definition of "same broker" used by Agent 2's deduplication, its
+column helpers and the master store: two records are the same broker when
+they share an email key, a phone key or a broker key (name + firm).
+Placeholder values ("Not Available", "Independent", "n/a" ...) mean nothing
+was found and never produce a key.
+"""
+
+import re
+from functools import lru_cache
+from typing import Optional
+
+# Values that mean "nothing found" (compared stripped and lowercased)
+PLACEHOLDERS = frozenset({
+    "", "not available", "not availabl", "independent", "general", "not specified",
+    "none", "nan", "n/a",
+})
+
+TITLES = frozenset({"mr", "mrs", "ms", "dr", "jr", "sr"})
+FIRM_SUFFIX = re.compile(r",?\s*\b(?:llc|inc|corp|ltd|llp|lp)\.?$")
+
+NON_DIGIT = re.compile(r"\D")
+NON_NAME = re.compile(r"[^a-z ]")
+NON_FIRM = re.compile(r"[^a-z0-9 ]")
+
+
+def is_placeholder(value) -> bool:
+    return value is None or str(value).strip().lower() in PLACEHOLDERS
+
+
+def email_key(email) -> Optional[str]:
+    if is_placeholder(email) or "@" not in str(email):
+        return None
+    return str(email).strip().lower()
+
+
+def phone_key(phone) -> Optional[str]:
+    """Last 10 digits ("+1 (555) 123-4567" and "555.123.4567" agree)"""
+    digits = NON_DIGIT.sub("", str(phone or ""))
+    return digits[-10:] if len(digits) >= 10 else None
+
+
+@lru_cache(maxsize=1 << 16)
+def name_key(name) -> Optional[str]:
+    """Lowercase letters and single spaces, titles dropped ("Dr. John  Smith" -> "john smith")"""
+    if is_placeholder(name):
+        return None
+    words = NON_NAME.sub(" ", str(name).lower()).split()
+    return " ".join(w for w in words if w not in TITLES) or None
+
+
+@lru_cache(maxsize=1 << 16)
+def firm_key(firm) -> str:
+    """Lowercase firm without its legal suffix ("Acme Brokers, LLC" -> "acme brokers"); "" if none"""
+    if is_placeholder(firm):
+        return ""
+    firm = FIRM_SUFFIX.sub("", str(firm).strip().lower())
+    return " ".join(NON_FIRM.sub(" ", firm).split())
+
+
+def broker_key(name, firm) -> Optional[str]:
+    """name_key|firm_key, or None without a real name"""
+    name = name_key(name)
+    return f"{name}|{firm_key(firm)}" if name else None
@@ -0,0 +1,162 @@
+"""
+Per-page timing spans for the scrapers
+
+Every page visit is broken into spans (launch, navigation, wait, reveal,
+extraction, politeness, retry) and appended as JSON lines to one metrics file
+per pipeline run: metrics/run_<PIPELINE_RUN_ID>.jsonl. The run id travels to
+the agent subprocesses through the environment.
+
+Summary:
+    python graph/shared/metrics.py [metrics_file]   (default: latest run)
+prints p50/p95/p99 per phase and per source/phase.
+"""
+
+import json
+import math
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+METRICS_DIR = Path(__file__).resolve().parents[2] / "metrics"
+
+
+def run_id() -> str:
+    """Current pipeline run id (created once, then inherited by subprocesses)"""
+    if not os.environ.get("PIPELINE_RUN_ID"):
+        os.environ["PIPELINE_RUN_ID"] = datetime.now().strftime("%Y%m%d-%H%M%S")
+    return os.environ["PIPELINE_RUN_ID"]
+
+
+def metrics_path(run: Optional[str] = None) -> Path:
+    return METRICS_DIR / f"run_{run or run_id()}.jsonl"
+
+
+class MetricsRecorder:
+    """Thread-safe JSON-lines span writer"""
+
+    def __init__(self, agent: str, path: Optional[Path] = None):
+        self.agent = agent
+        self.path = Path(path) if path else metrics_path()
+        self._lock = threading.Lock()
+
+    def record(self, phase: str, source: str, seconds: float,
+               url: Optional[str] = None, ok: bool = True, **extra):
+        entry = {
+            "run": run_id(),
+            "agent": self.agent,
+            "phase": phase,
+            "source": source,
+            "url": url,
+            "seconds": round(seconds, 4),
+            "ok": ok,
+            "ts": time.time(),
+            **extra,
+        }
+        line = json.dumps(entry, default=str) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+    @contextmanager
+    def span(self, phase: str, source: str, url: Optional[str] = None, **extra):
+        """Time a block; the span is recorded with ok=False if it raises"""
+        start = time.perf_counter()
+        ok = True
+        try:
+            yield
+        except BaseException:
+            ok = False
+            raise
+        finally:
+            self.record(phase, source, time.perf_counter() - start, url=url, ok=ok, **extra)
+
+
+_recorders = {}
+_recorders_lock = threading.Lock()
+
+
+def recorder(agent: str) -> MetricsRecorder:
+    """Shared recorder per agent for the current run"""
+    with _recorders_lock:
+        if agent not in _recorders:
+            _recorders[agent] = MetricsRecorder(agent)
+        return _recorders[agent]
+
+
+# ----------------------- SUMMARY -----------------------
+
+def load(path) -> List[Dict]:
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue  # partial line from an interrupted run
+    return records
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(records: List[Dict]) -> Dict[tuple, Dict[str, float]]:
+    """{(source, phase): stats}, with source "*" for the all-sources rows"""
+    groups = defaultdict(list)
+    for r in records:
+        groups[("*", r["phase"])].append(r["seconds"])
+        groups[(r["source"], r["phase"])].append(r["seconds"])
+
+    summary = {}
+    for key, values in groups.items():
+        values.sort()
+        summary[key] = {
+            "count": len(values),
+            "total": sum(values),
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+            "p99": percentile(values, 99),
+        }
+    return summary
+
+
+def print_summary(path=None):
+    path = Path(path) if path else latest_metrics_file()
+    if not path or not path.exists():
+        print("⚠ No metrics file found")
+        return
+
+    summary = summarize(load(path))
+    print("\n" + "=" * 70)
+    print(f"⏱  SCRAPER TIMINGS: {path.name}")
+    print("=" * 70)
+    print(f"{'source':<28}{'phase':<12}{'count':>7}{'total s':>10}{'p50':>8}{'p95':>8}{'p99':>8}")
+
+    # All-sources rows first, then per source; heaviest phases first
+    for key in sorted(summary, key=lambda k: (k[0] != "*", k[0], -summary[k]["total"])):
+        s = summary[key]
+        print(f"{key[0]:<28}{key[1]:<12}{s['count']:>7}{s['total']:>10.1f}"
+              f"{s['p50']:>8.2f}{s['p95']:>8.2f}{s['p99']:>8.2f}")
+    print("=" * 70)
+
+
+def latest_metrics_file() -> Optional[Path]:
+    files = sorted(METRICS_DIR.glob("run_*.jsonl"), key=lambda p: p.stat().st_mtime)
+    return files[-1] if files else None
+
+
+if __name__ == "__main__":
+    print_summary(sys.argv[1] if len(sys.argv) > 1 else None)
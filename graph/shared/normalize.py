@@ -0,0 +1,158 @@
+"""
+Money / number normalization shared by all agents
+
+Scalar API for scrapers:
+    parse_money("$1.2M")            -> 1200000.0
+    parse_money("$250K - $400K")    -> 250000.0   (ranges: low end)
+    parse_money("Not Disclosed")    -> None
+    parse_money("Price on request: $450,000") -> 450000.0
+    normalize_money("$1.2M")        -> 1200000    (int, 0 when unknown - Agent 1 columns)
+
+Column API for pandas:
+    parse_money_series(df["Asking Price"])  -> float Series, NaN when unknown
+
+Numeric columns pass straight through; text columns are factorized so each
+distinct value is parsed once. The common forms ("$1,234,567", "450000",
+"$1.2M", "250K") are parsed together with numpy array operations; only the
+rest (ranges, wording) go through parse_money() one value at a time.
+"""
+
+import math
+import re
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# Whole words only ("nan" must not hit "financing")
+UNDISCLOSED = ("undisclosed", "disclosed", "n/a", "none", "call", "contact", "request", "negotiable", "nan")
+UNDISCLOSED_RE = re.compile(r"\b(?:" + "|".join(re.escape(word) for word in UNDISCLOSED) + r")\b")
+
+MULTIPLIERS = {
+    "k": 1e3, "thousand": 1e3,
+    "m": 1e6, "mm": 1e6, "mil": 1e6, "million": 1e6,
+    "b": 1e9, "bn": 1e9, "billion": 1e9,
+}
+
+# First amount in the text (so "low - high" ranges give the low end), with optional suffix
+MONEY_RE = re.compile(
+    r"(\d+(?:\.\d+)?)\s*(thousand|million|billion|mil|mm|bn|[kmb])?(?![a-z])"
+)
+
+
+def parse_money(value) -> Optional[float]:
+    """Parse one money value. None when missing, undisclosed or unparseable."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, bool):
+        return None if math.isnan(value) else float(value)
+
+    raw = str(value).lower()
+    text = raw.replace(",", "").replace("$", "").strip()
+    match = MONEY_RE.search(text)
+    if not match:
+        return None
+    # "Price on request: $450,000" is a price; in "Call 555-1234" or "Contact for
+    # details (2 locations)" a bare number is not, so the wording wins there
+    if UNDISCLOSED_RE.search(text) and "$" not in raw and not match.group(2):
+        return None
+    amount = float(match.group(1))
+
+    suffix = match.group(2)
+    if not suffix:
+        # "1.5 - 2M": a bare low end borrows the range's suffix
+        rest = MONEY_RE.search(text, match.end())
+        if rest and rest.group(2) and re.match(r"\s*(-|to)\s*$", text[match.end():rest.start()]):
+            suffix = rest.group(2)
+    return amount * MULTIPLIERS.get(suffix, 1)
+
+
+def normalize_money(value) -> int:
+    """parse_money() as an int, 0 when unknown (Agent 1's column convention)"""
+    amount = parse_money(value)
+    return int(amount) if amount is not None else 0
+
+
+def _parse_distinct(value) -> float:
+    try:
+        return float(value)  # plain numbers, the usual case for Agent 1 output
+    except (TypeError, ValueError):
+        amount = parse_money(value)
+        return np.nan if amount is None else amount
+
+
+# Character classes of a plain amount ("$1,234,567", "1.2M", "250 k"), by ASCII code
+BAD, DIGIT, DOT, SPACE, IGNORED, SUFFIX = range(6)
+CHAR_CLASS = np.full(128, BAD, dtype=np.uint8)
+CHAR_CLASS[[ord(c) for c in "0123456789"]] = DIGIT
+CHAR_CLASS[ord(".")] = DOT
+CHAR_CLASS[ord(" ")] = SPACE
+CHAR_CLASS[[ord("$"), ord(","), 0]] = IGNORED  # 0: padding of shorter strings in a numpy str array
+CHAR_MULTIPLIER = np.ones(128)
+for letter in "kmbKMB":
+    CHAR_CLASS[ord(letter)] = SUFFIX
+    CHAR_MULTIPLIER[ord(letter)] = MULTIPLIERS[letter.lower()]
+PLAIN_WIDTH = 24                  # Longer texts go to parse_money()
+POW10 = np.array([float(10 ** i) for i in range(16)])
+
+
+def _parse_plain(texts: np.ndarray):
+    """
+    (amounts, ok) for texts that are just an amount: "$", commas and spaces
+    around it, at most 15 digits, one "." and one K/M/B suffix. Scans the
+    strings a character column at a time over all rows, building each amount
+    as digits / 10**decimals, which is exactly what float() gives, so results
+    match parse_money(). Anything else comes back with ok=False.
+    """
+    n = len(texts)
+    lengths = np.char.str_len(texts)
+    width = int(np.clip(lengths.max(initial=0), 1, PLAIN_WIDTH))
+    codes = texts.astype(f"<U{width}").view(np.uint32).reshape(n, width)
+    columns = np.ascontiguousarray(np.minimum(codes, 127).T)  # non-ASCII -> DEL, a BAD character
+
+    mantissa = np.zeros(n, dtype=np.int64)
+    digits, decimals = np.zeros(n, dtype=np.int64), np.zeros(n, dtype=np.int64)
+    multiplier = np.ones(n)
+    seen_dot, seen_suffix, gap = np.zeros(n, bool), np.zeros(n, bool), np.zeros(n, bool)
+    open_dot = np.zeros(n, bool)  # a "." with no digit after it yet
+    bad = lengths > PLAIN_WIDTH
+
+    for column in columns:
+        kind = CHAR_CLASS[column]
+        digit, dot, suffix = kind == DIGIT, kind == DOT, kind == SUFFIX
+        seen_digit = digits > 0
+
+        bad |= kind == BAD
+        bad |= (digit | dot) & (seen_suffix | gap)                # "1 000", "1m5"
+        bad |= dot & (seen_dot | ~seen_digit)                     # "1.2.3", ".5"
+        bad |= suffix & (seen_suffix | ~seen_digit | open_dot)    # "1mm", "k5", "5.m"
+        gap |= (kind == SPACE) & seen_digit
+
+        mantissa = np.where(digit, mantissa * 10 + (column.astype(np.int64) - ord("0")), mantissa)
+        digits += digit
+        decimals += digit & seen_dot
+        multiplier = np.where(suffix, CHAR_MULTIPLIER[column], multiplier)
+        seen_dot |= dot
+        open_dot = (open_dot | dot) & ~digit
+        seen_suffix |= suffix
+
+    ok = ~bad & (digits > 0) & (digits < len(POW10))
+    amounts = np.where(ok, mantissa / POW10[np.minimum(decimals, len(POW10) - 1)] * multiplier, np.nan)
+    return amounts, ok
+
+
+def parse_money_series(series: pd.Series) -> pd.Series:
+    """Vectorized parse_money() over a column; returns float64 with NaN for unknown"""
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series.astype("float64")
+
+    # Each distinct value is parsed once, then broadcast back by code: plain
+    # amounts all together, the rest (ranges, wording) one at a time
+    codes, uniques = pd.factorize(series)
+    uniques = np.asarray(uniques, dtype=object)
+    parsed, ok = _parse_plain(uniques.astype(str))
+    rest = np.flatnonzero(~ok)
+    parsed[rest] = np.fromiter((_parse_distinct(u) for u in uniques[rest]), dtype="float64", count=len(rest))
+
+    values = np.where(codes >= 0, parsed[codes] if len(parsed) else np.nan, np.nan)
+    return pd.Series(values, index=series.index, name=series.name)
@@ -0,0 +1,42 @@
+"""
+Rendered listing pages handed from Agent 1 to Agent 2
+
+Agent 1 already has every listing page loaded, so it stores the rendered HTML
+(gzipped, one file per canonical URL) and puts the file name in the
+"Page Archive" column of listings.csv. Agent 2 extracts from that snapshot
+first and only reopens the live page when the contact details need a click.
+"""
+
+import gzip
+import hashlib
+from pathlib import Path
+from typing import Optional
+
+from graph.shared.frontier import canonicalize_url
+
+
+def page_name(url: str) -> str:
+    """Archive file name for a listing URL"""
+    return hashlib.sha1(canonicalize_url(url).encode("utf-8")).hexdigest()[:20] + ".html.gz"
+
+
+def save_page(directory, url: str, html: str) -> str:
+    """Write one rendered page; returns the file name for the "Page Archive" column"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    name = page_name(url)
+    with gzip.open(directory / name, "wt", encoding="utf-8") as f:
+        f.write(html)
+    return name
+
+
+def load_page(directory, name) -> Optional[str]:
+    """HTML of an archived page, or None if there is no usable snapshot"""
+    if not name or not isinstance(name, str):
+        return None
+    path = Path(directory) / Path(name).name
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return f.read()
+    except (OSError, EOFError):
+        return None
@@ -0,0 +1,118 @@
+"""
+Per-domain politeness
+
+Every domain has a "next allowed" timestamp. Callers reserve the next slot for a
+domain and wait only for that domain, so requests to other sites are never held
+back by one site's delay. Works from threads (wait) and asyncio (acquire).
+
+DomainScheduler hands work to a fixed set of workers in domain round-robin,
+always from a site the limiter would let through now, so one site's delay
+overlaps with work on the others instead of stalling a worker.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import Counter, deque
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+class DomainRateLimiter:
+    """Minimum (jittered) spacing between requests to the same domain"""
+
+    def __init__(self, delay: Tuple[float, float] = (0, 0),
+                 per_domain: Optional[Dict[str, Tuple[float, float]]] = None):
+        """
+        Args:
+            delay: (min, max) seconds between two requests to one domain
+            per_domain: overrides of `delay` keyed by domain
+        """
+        self.delay = delay
+        self.per_domain = per_domain or {}
+        self._next_allowed = {}
+        self._lock = threading.Lock()
+
+    def interval(self, domain: str) -> float:
+        # Keys may carry an exit suffix ("domain|proxy") so each egress IP is paced separately
+        low, high = self.per_domain.get(domain.split("|", 1)[0], self.delay)
+        return random.uniform(low, high) if high > low else low
+
+    def ready_in(self, domain: str) -> float:
+        """
+        Seconds until `domain` may be hit again (0 if ready now). A bare domain
+        paced per exit ("domain|proxy" keys) is ready when its first exit is.
+        """
+        with self._lock:
+            if "|" in domain or domain in self._next_allowed:
+                slot = self._next_allowed.get(domain, 0.0)
+            else:
+                prefix = domain + "|"
+                slot = min((t for key, t in self._next_allowed.items() if key.startswith(prefix)), default=0.0)
+            return max(0.0, slot - time.monotonic())
+
+    def reserve(self, domain: str) -> float:
+        """Claim the next slot for `domain`; returns how long to wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_allowed.get(domain, 0.0))
+            self._next_allowed[domain] = start + self.interval(domain)
+            return start - now
+
+    def wait(self, domain: str) -> float:
+        """Blocking: sleep until the reserved slot. Returns seconds slept."""
+        delay = self.reserve(domain)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire(self, domain: str) -> float:
+        """asyncio version of wait()"""
+        delay = self.reserve(domain)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+
+class DomainScheduler:
+    """
+    Work items queued per domain and handed out round-robin. next() picks the
+    first domain in rotation that no worker is on and the limiter would allow
+    now; when none is ready, the one that is ready soonest. Thread-safe.
+    """
+
+    def __init__(self, limiter: DomainRateLimiter, items: Iterable[Tuple[str, Any]]):
+        """
+        Args:
+            limiter: the rate limiter the workers wait on
+            items: (domain, item) pairs, in the order each domain should process them
+        """
+        self.limiter = limiter
+        self._queues: Dict[str, deque] = {}  # insertion order = rotation order
+        self._active = Counter()
+        self._lock = threading.Lock()
+        for domain, item in items:
+            self._queues.setdefault(domain, deque()).append(item)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(q) for q in self._queues.values())
+
+    def next(self) -> Optional[Tuple[str, Any]]:
+        """(domain, item) to work on next, or None when everything was handed out"""
+        with self._lock:
+            if not self._queues:
+                return None
+            # min() keeps the first of equals, i.e. rotation order
+            domain = min(self._queues, key=lambda d: (self._active[d] > 0, self.limiter.ready_in(d)))
+            queue = self._queues.pop(domain)
+            item = queue.popleft()
+            if queue:
+                self._queues[domain] = queue  # back of the rotation
+            self._active[domain] += 1
+            return domain, item
+
+    def done(self, domain: str):
+        """The worker that took an item from `domain` has finished it"""
+        with self._lock:
+            self._active[domain] -= 1
@@ -0,0 +1,147 @@
+"""
+Failure handling for the scrapers
+
+- CircuitBreaker per domain: N consecutive failures open it, so every further
+  request to that site fails immediately; after reset_timeout one probe is let
+  through (half-open) and its result closes or re-opens the circuit.
+- RetryBudget: one pool of retries for the whole run, so a degraded site cannot
+  spend the run's time on retries.
+- call_with_retry(): retries with full-jitter exponential backoff, drawing from
+  the budget and reporting to the breaker.
+"""
+
+import random
+import threading
+import time
+from typing import Callable, Optional
+
+CHALLENGE_MARKERS = (
+    "just a moment",
+    "checking your browser",
+    "verify you are human",
+    "are you a robot",
+    "press & hold",
+    "access denied",
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of making a request to a domain whose circuit is open"""
+
+
+class ChallengeError(Exception):
+    """The site answered with a bot challenge instead of the page"""
+
+
+def is_challenge(text: Optional[str]) -> bool:
+    """Heuristic: does this page text look like a bot-challenge page?"""
+    head = (text or "")[:3000].lower()
+    return any(marker in head for marker in CHALLENGE_MARKERS)
+
+
+class CircuitBreaker:
+    """closed -> open after `failure_threshold` consecutive failures -> half-open after `reset_timeout`"""
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 120):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._probing = False
+            if self.state == self.HALF_OPEN and not self._probing:
+                self._probing = True  # exactly one probe at a time
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+            self._probing = False
+
+
+class DomainBreakers:
+    """One CircuitBreaker per domain, created on first use"""
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 120):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, domain: str) -> CircuitBreaker:
+        with self._lock:
+            if domain not in self._breakers:
+                self._breakers[domain] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return self._breakers[domain]
+
+    def allow(self, domain: str) -> bool:
+        return self.get(domain).allow()
+
+
+class RetryBudget:
+    """Retries left for the whole run (thread-safe)"""
+
+    def __init__(self, total: int):
+        self.remaining = total
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self._lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+
+def call_with_retry(fn: Callable, domain: str, breakers: DomainBreakers, budget: RetryBudget,
+                    attempts: int = 3, base_delay: float = 2, max_delay: float = 30,
+                    metrics=None, url: Optional[str] = None):
+    """
+    Run fn() for `domain` with breaker checks and jittered-backoff retries.
+
+    Raises CircuitOpenError without calling fn when the domain's circuit is open,
+    and re-raises fn's last error once attempts or the retry budget run out.
+    """
+    breaker = breakers.get(domain)
+
+    for attempt in range(1, attempts + 1):
+        if not breaker.allow():
+            raise CircuitOpenError(f"circuit open for {domain}")
+
+        try:
+            result = fn()
+        except Exception as e:
+            breaker.record_failure()
+            if attempt == attempts or not budget.take():
+                raise
+
+            delay = random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1)))
+            print(f"   ↻ Retry {attempt}/{attempts - 1} for {domain} in {delay:.1f}s ({str(e)[:40]})")
+            if metrics:
+                metrics.record("retry", domain, delay, url=url, attempt=attempt, error=type(e).__name__)
+            time.sleep(delay)
+            continue
+
+        breaker.record_success()
+        return result
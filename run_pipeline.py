@@ -11,6 +11,8 @@ from datetime import datetime
 import shutil
 import subprocess
 
+from graph.shared.metrics import run_id, metrics_path, print_summary
+
 # --------------------------------------------------
 # HELPERS
 # --------------------------------------------------
@@ -59,6 +61,12 @@ def copy_agent1_output():
     shutil.copy(source, dest)
     print(f"✓ Copied {source} → {dest}")
 
+    # Rendered listing pages, so Agent 2 can extract without reloading them
+    pages = Path("agent_1/output/pages")
+    if pages.exists():
+        shutil.copytree(pages, dest_dir / "pages", dirs_exist_ok=True)
+        print(f"✓ Copied {pages} → {dest_dir / 'pages'}")
+
 
 # --------------------------------------------------
 # AGENT 2
@@ -202,6 +210,9 @@ def verify_outputs():
 def main():
     start_time = datetime.now()
 
+    # One run id for every agent subprocess -> one metrics file per run
+    run_id()
+
     print("\n" + "=" * 70)
     print("🎯 MULTI-AGENT BUSINESS ACQUISITION PIPELINE")
     print("=" * 70)
@@ -243,6 +254,9 @@ def main():
         print(f"Duration: {int(duration // 60)}m {int(duration % 60)}s")
         print("=" * 70)
 
+        # Where the scraper time went (p50/p95/p99 per phase and source)
+        print_summary(metrics_path())
+
         return 0
 
     except KeyboardInterrupt:
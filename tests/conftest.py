@@ -0,0 +1,9 @@
+"""Imports as the agents see them: graph.shared from the repo root, Agent 2's agent/config/utils packages"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+for path in (ROOT, ROOT / "agent_2"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
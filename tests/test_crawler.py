@@ -0,0 +1,42 @@
+import asyncio
+
+from aiohttp import web
+
+from graph.shared.crawler import AsyncCrawler
+from graph.shared.http_cache import HttpCache
+
+PAGES = {
+    "/profile": "<html>Jane Doe jane@acme.com</html>",
+    "/challenge": "<html><title>Just a moment...</title></html>",
+}
+
+
+async def page(request):
+    return web.Response(text=PAGES[request.path], content_type="text/html")
+
+
+def crawl_local(cache, paths):
+    async def main():
+        app = web.Application()
+        app.router.add_get("/{page}", page)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        try:
+            urls = [f"http://127.0.0.1:{port}{path}" for path in paths]
+            return urls, await AsyncCrawler(cache=cache).crawl(urls)
+        finally:
+            await runner.cleanup()
+
+    return asyncio.run(main())
+
+
+def test_challenge_page_is_not_cached(tmp_path):
+    cache = HttpCache(tmp_path)
+    (profile, challenge), results = crawl_local(cache, ["/profile", "/challenge"])
+
+    assert [r["status"] for r in results] == [200, 200]
+    assert cache.lookup(profile)["text"] == PAGES["/profile"]
+    assert cache.lookup(challenge) is None
@@ -0,0 +1,38 @@
+from graph.shared.database import PipelineDB
+
+
+def broker(name, email, url):
+    return {"broker_name": name, "brokerage_firm": "Acme", "email": email, "source_listing_url": url}
+
+
+def test_reads_are_scoped_to_a_run(tmp_path):
+    with PipelineDB(tmp_path / "p.db") as db:
+        db.upsert_listings([{"Listing URL": "https://x.com/1"}], run_id="20260101-000000")
+        db.upsert_brokers([broker("Jane Doe", "jane@acme.com", "https://x.com/1")], run_id="20260101-000000")
+        db.upsert_listings([{"Listing URL": "https://x.com/2"}], run_id="20260102-000000")
+        db.upsert_brokers([broker("Bob Roe", "bob@acme.com", "https://x.com/2"),
+                           broker("Jane Doe", "JANE@acme.com", "https://x.com/2")], run_id="20260102-000000")
+
+        assert db.latest_run() == "20260102-000000"
+        assert list(db.brokers_df(run_id="20260101-000000")["broker_name"]) == []
+        assert list(db.brokers_df(run_id="20260102-000000")["broker_name"]) == ["Jane Doe", "Bob Roe"]
+        assert list(db.listings_df(run_id="20260102-000000")["Listing URL"]) == ["https://x.com/2"]
+        assert len(db.brokers_df()) == 2
+
+
+def test_drafted_brokers_are_not_picked_again(tmp_path):
+    with PipelineDB(tmp_path / "p.db") as db:
+        db.upsert_brokers([{**broker("Jane Doe", "jane@acme.com", ""), "record_id": "b1"},
+                           {**broker("Bob Roe", "bob@acme.com", ""), "record_id": "b2"}])
+        db.mark_drafted(["b1"])
+        assert list(db.brokers_df(undrafted=True)["record_id"]) == ["b2"]
+
+
+def test_merged_broker_is_linked_to_every_listing(tmp_path):
+    from utils.entity_resolution import resolve_entities
+
+    merged, _ = resolve_entities([broker("Jane Doe", "jane@acme.com", "https://x.com/1"),
+                                  broker("Jane Doe", "JANE@acme.com", "https://x.com/2?utm_source=feed")])
+    with PipelineDB(tmp_path / "p.db") as db:
+        db.upsert_brokers(merged)
+        assert db.resolved_listing_urls() == {"https://x.com/1", "https://x.com/2"}
@@ -0,0 +1,61 @@
+import pytest
+
+pytest.importorskip("seleniumbase")
+
+from agent.nodes import extraction_node
+from utils import scraper as scraper_module
+from utils.journal import ExtractionJournal
+
+
+@pytest.fixture
+def offline(tmp_path, monkeypatch):
+    """No retries, no cache, parsing in-process, journal and selector stats under tmp_path"""
+    monkeypatch.setattr(extraction_node, "EXTRACTION_JOURNAL", tmp_path / "journal.jsonl")
+    monkeypatch.setitem(scraper_module.SCRAPING_CONFIG, "retry_attempts", 1)
+    monkeypatch.setitem(scraper_module.SCRAPING_CONFIG, "parse_workers", 0)
+    monkeypatch.setattr(scraper_module.LISTING_CACHE, "lookup", lambda url: None)
+    monkeypatch.setattr(scraper_module.LISTING_CACHE, "store", lambda *a, **k: None)
+    monkeypatch.setattr(scraper_module.SELECTOR_STATS, "save", lambda: None)
+    return tmp_path / "journal.jsonl"
+
+
+def test_failed_live_page_is_not_journaled(offline, monkeypatch):
+    def crash(self, url):
+        raise RuntimeError("page crashed")
+
+    monkeypatch.setattr(scraper_module.BrokerScraper, "_visit", crash)
+    listing = {"Listing URL": "https://crash.example.com/listing/1", "Broker or Seller Contact": "Jane Doe"}
+
+    update = extraction_node.deep_extraction_node({"listings_to_process": [listing]})
+
+    assert ExtractionJournal(offline).get(listing["Listing URL"]) is None
+    assert any("page crashed" in error for error in update["errors"])
+
+
+def test_clean_result_is_journaled(offline, monkeypatch):
+    html = "<html><div>Broker: Jane Doe</div> jane@acme.com (555) 123-4567</html>"
+    monkeypatch.setattr(scraper_module.BrokerScraper, "_visit", lambda self, url: (html, []))
+    listing = {"Listing URL": "https://ok.example.com/listing/1"}
+
+    update = extraction_node.deep_extraction_node({"listings_to_process": [listing]})
+
+    status, record = ExtractionJournal(offline).get(listing["Listing URL"])
+    assert status == extraction_node.ADDED
+    assert record["email"] == "jane@acme.com"
+    assert update["errors"] == []
+
+
+def test_run_without_brokers_clears_journal(offline, tmp_path, monkeypatch):
+    from agent.nodes import export_node
+    from graph.shared import database
+
+    monkeypatch.setattr(export_node, "EXTRACTION_JOURNAL", offline)
+    monkeypatch.setattr(database, "DB_PATH", tmp_path / "p.db")
+    listing = {"Listing URL": "https://empty.example.com/listing/1"}
+    ExtractionJournal(offline).record(listing["Listing URL"], extraction_node.NO_DATA, None)
+
+    export_node.export_brokers_node({"broker_database": [], "input_listings": [listing]})
+
+    assert len(ExtractionJournal(offline)) == 0
+    with database.PipelineDB() as db:
+        assert db.count("listings") == 1
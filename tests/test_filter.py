@@ -0,0 +1,21 @@
+from agent.nodes.filter_node import filter_listings_node
+from graph.shared import database
+from utils.entity_resolution import resolve_entities
+
+
+def test_listings_of_one_resolved_broker_are_not_extracted_again(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, "DB_PATH", tmp_path / "p.db")
+    listings = [{"Listing URL": f"https://x.com/listing/{i}", "Broker or Seller Contact": ""} for i in (1, 2)]
+    extracted = [{"broker_name": "Jane Doe", "brokerage_firm": "Acme", "email": "jane@acme.com",
+                  "source_listing_url": listing["Listing URL"]} for listing in listings]
+
+    # First run: both listings turn out to be the same broker
+    merged, duplicates = resolve_entities(extracted)
+    assert duplicates == 1
+    with database.PipelineDB() as db:
+        db.upsert_listings(listings)
+        db.upsert_brokers(merged)
+
+    # Next run: neither listing goes back to extraction
+    update = filter_listings_node({"input_listings": listings})
+    assert update["listings_to_process"] == []
@@ -0,0 +1,45 @@
+import pandas as pd
+import pytest
+
+from graph.shared.database import PipelineDB
+from graph.shared.identity import PLACEHOLDERS, broker_key, firm_key, is_placeholder, name_key
+from utils.columns import blank
+from utils.entity_resolution import resolve_entities
+
+
+def broker(name, firm="Acme", email="", phone=""):
+    return {"broker_name": name, "brokerage_firm": firm, "email": email, "phone": phone}
+
+
+@pytest.mark.parametrize("a, b, same", [
+    (broker("Dr. John Smith", "Acme Brokers, LLC"), broker("john  smith", "acme brokers"), True),
+    (broker("John Smith", "Acme"), broker("John Smith", "Other Co"), False),
+    (broker("Jane Doe", email="JANE@acme.com"), broker("J. Doe", email="jane@acme.com "), True),
+    (broker("Jane Doe", phone="+1 (555) 123-4567"), broker("Bob Roe", phone="555.123.4567"), True),
+    (broker("Jane Doe", email="Not Available"), broker("Bob Roe", email="not available"), False),
+    (broker("N/A", "Independent"), broker("n/a", "Independent"), False),
+])
+def test_dedup_and_store_agree_on_same_broker(tmp_path, a, b, same):
+    merged, _ = resolve_entities([dict(a), dict(b)])
+    assert len(merged) == (1 if same else 2)
+
+    with PipelineDB(tmp_path / "p.db") as db:
+        db.upsert_brokers([dict(a)])
+        db.upsert_brokers([dict(b)])
+        assert db.count("brokers") == (1 if same else 2)
+
+
+def test_placeholders_are_blank_everywhere():
+    values = sorted(PLACEHOLDERS) + ["Not Available", " N/A ", "INDEPENDENT", None]
+    assert all(is_placeholder(v) for v in values)
+    assert blank(pd.Series(values, dtype=object)).all()
+    assert not blank(pd.Series(["Jane Doe", "jane@acme.com"])).any()
+
+
+def test_keys():
+    assert name_key("Mr. JOHN  o'neil Jr") == "john o neil"
+    assert name_key("Not Available") is None
+    assert firm_key("Acme Brokers, Inc.") == "acme brokers"
+    assert firm_key("Independent") == ""
+    assert broker_key("Dr John Smith", "Acme LLC") == "john smith|acme"
+    assert broker_key("", "Acme") is None
@@ -0,0 +1,47 @@
+import pytest
+
+pytest.importorskip("seleniumbase")
+
+from graph.shared.http_cache import HttpCache
+from utils import scraper as scraper_module
+
+URL = "https://cache.example.com/listing/1"
+
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    """Listing cache under tmp_path, no retries, parsing in-process"""
+    monkeypatch.setattr(scraper_module, "LISTING_CACHE", HttpCache(tmp_path))
+    monkeypatch.setitem(scraper_module.SCRAPING_CONFIG, "retry_attempts", 1)
+    monkeypatch.setitem(scraper_module.SCRAPING_CONFIG, "parse_workers", 0)
+    monkeypatch.setattr(scraper_module.SELECTOR_STATS, "save", lambda: None)
+    with scraper_module.BrokerScraper(pool_size=1) as s:
+        yield s
+
+
+def test_cache_hit_keeps_revealed_contacts(scraper, monkeypatch):
+    revealed = [{"agent": {"name": "Jane Doe", "email": "jane@acme.com", "phone": "555-123-4567"}}]
+    monkeypatch.setattr(scraper_module.BrokerScraper, "_visit",
+                        lambda self, url: ("<html>Contact the broker</html>", revealed))
+    first = scraper.extract_broker_data(URL)
+
+    def no_visit(self, url):
+        raise AssertionError("fresh listing visited again")
+
+    monkeypatch.setattr(scraper_module.BrokerScraper, "_visit", no_visit)
+    second = scraper.extract_broker_data(URL)
+
+    assert first["email"] == second["email"] == "jane@acme.com"
+    assert second["phone"] == first["phone"]
+    assert scraper_module.LISTING_CACHE.counts == {"hit": 1, "revalidated": 0, "miss": 1}
+
+
+def test_failed_visit_is_not_a_miss(scraper, monkeypatch):
+    def crash(self, url):
+        raise RuntimeError("page crashed")
+
+    monkeypatch.setattr(scraper_module.BrokerScraper, "_visit", crash)
+
+    assert scraper.extract_broker_data(URL)["error"] == "page crashed"
+    assert scraper_module.LISTING_CACHE.counts["miss"] == 0
+    assert scraper_module.LISTING_CACHE.lookup(URL) is None
@@ -0,0 +1,50 @@
+import math
+import random
+
+import pandas as pd
+import pytest
+
+from graph.shared.normalize import parse_money, parse_money_series
+
+
+@pytest.mark.parametrize("text, amount", [
+    ("$1.2M", 1_200_000),
+    ("$250K - $400K", 250_000),
+    ("1.5 - 2M", 1_500_000),
+    ("Seller financing $300K", 300_000),
+    ("Contact for details – $1.2M", 1_200_000),
+    ("Price on request: $450,000", 450_000),
+    ("Negotiable, 2 million", 2_000_000),
+    (475000, 475_000),
+])
+def test_amounts(text, amount):
+    assert parse_money(text) == amount
+
+
+@pytest.mark.parametrize("text", [
+    "Not Disclosed", "Undisclosed", "N/A", "nan", "None", "", None, float("nan"),
+    "Call 555-1234", "Contact broker for details (2 locations)",
+])
+def test_undisclosed(text):
+    assert parse_money(text) is None
+
+
+def test_series_matches_scalar():
+    values = ["Seller financing $300K", "Not Disclosed", "$1.2M", "$1.2M", None]
+    parsed = parse_money_series(pd.Series(values))
+    assert [None if math.isnan(v) else v for v in parsed] == [parse_money(v) for v in values]
+
+
+def test_series_fast_path_matches_scalar():
+    rng = random.Random(0)
+    values = ["$1,234,567", "1.2M", "250 k", "$ 450,000 ", "1.", "2B", "12$34", "999999999999999",
+              "1234567890123456", "1 000", ".5", "1.2.3", "1mm", "k5", "1.5 - 2M", "١٢", 7, 1.5, ""]
+    values += ["".join(rng.choice("0123456789.,$ kmKMB") for _ in range(rng.randint(0, 10)))
+               for _ in range(5000)]
+    parsed = parse_money_series(pd.Series(values, dtype=object))
+    for value, amount in zip(values, parsed):
+        try:
+            expected = float(value)  # plain numbers (".5" included) are taken as is, as before
+        except ValueError:
+            expected = parse_money(value)
+        assert (math.isnan(amount) and expected is None) or amount == expected, value
@@ -0,0 +1,13 @@
+import pytest
+
+from graph.shared.proxies import ProxyPool
+
+
+def test_http_exits_are_accepted():
+    pool = ProxyPool(["user:pass@10.0.0.5:3128", "http://10.0.0.6:3128/"])
+    assert [e.sb_proxy for e in pool.exits] == ["user:pass@10.0.0.5:3128", "10.0.0.6:3128"]
+
+
+def test_socks_exits_are_rejected():
+    with pytest.raises(ValueError, match="only http"):
+        ProxyPool(["socks5://10.0.0.6:1080"])